@@ -1,11 +1,15 @@
-from typing import List
+from typing import Dict, Iterable, List, Tuple, Union, Optional
+import bisect
+import collections
 import copy
+import itertools
 import numpy as np
-import scipy.stats
 import augtxt.typo
 import augtxt.order
 import augtxt.punct
-import re
+import augtxt.tokenizer
+import augtxt.keyboard_layouts as kbl
+from augtxt.rng import get_rng, shard_rng
 
 
 fn_dict = {
@@ -14,27 +18,197 @@ fn_dict = {
     'typo.drop_char': augtxt.typo.drop_char,
     'typo.drop_n_next_twice': augtxt.typo.drop_n_next_twice,
     'typo.pressed_shiftalt': augtxt.typo.pressed_shiftalt,
+    'typo.pressed_neighbour': augtxt.typo.pressed_neighbour,
 }
 
 
-def random_args(cfg_: dict):
+def random_args(cfg_: dict, rng: Optional[np.random.Generator] = None):
     """ randomly pick alternative args """
     cfg = copy.copy(cfg_)
     for k, v in cfg.items():
         if isinstance(v, (list, tuple)):
-            j = scipy.stats.randint.rvs(0, len(v))
+            j = get_rng(rng).integers(0, len(v))
             cfg[k] = v[j]
     return cfg
 
 
-def wordtypo(original: str, settings: List[dict]) -> str:
+class AugmentationPlan(object):
+    """Validated and compiled augmentation settings
+
+    Parameters:
+    -----------
+    settings : List[dict]
+        Each dict has the name of the augmentation function 'fn' (see
+          `fn_dict` and `fn_dict2`), its 'args', and either the probability
+          'p' to apply it (`wordtypo`), or a 'weight' to pick it
+          (`senttypo`, `sentaugm`). A 'keymap', 'trans', or 'geometry' arg
+          can also be the name of a dict in `augtxt.keyboard_layouts`, e.g.
+          "qwertz_de".
+
+    Attributes:
+    -----------
+    fns : List[Callable]
+        The augmentation functions
+
+    edit_fns : List[Callable]
+        The edit script of each typo function (see
+          `augtxt.typo.apply_edits`), and None for the other functions
+
+    p : List[float]
+        The probabilities to apply each function (None if not specified)
+
+    cdf : np.ndarray
+        The cumulative normalized weights (None if not specified)
+
+    Example:
+    --------
+        from augtxt.augmenters import AugmentationPlan, senttypo
+        plan = AugmentationPlan([
+            {'weight': 2, 'fn': 'typo.drop_n_next_twice',
+             'args': {'loc': ['m', 'e'], 'keep_case': True}},
+            {'weight': 1, 'fn': 'typo.swap_consecutive',
+             'args': {'loc': ['m', 'e'], 'keep_case': True}}])
+        augm = senttypo('Die Lehrerin [MASK] einen Roman.', plan)
+    """
+    def __init__(self, settings: List[dict]):
+        functions = {**fn_dict, **fn_dict2}
+        self.settings = settings
+        self.names, self.fns, self.fixed, self.choices = [], [], [], []
+        self.edit_fns = []
+        for item in settings:
+            name = item.get("fn")
+            if name not in functions:
+                raise ValueError(f"Unknown augmentation function: '{name}'")
+            args = item.get("args") or {}
+            if not isinstance(args, dict):
+                raise ValueError(f"The 'args' of '{name}' must be a dict")
+            args = {k: _resolve_layout(k, v) for k, v in args.items()}
+            self.names.append(name)
+            self.fns.append(functions[name])
+            self.edit_fns.append(augtxt.typo._edit_functions.get(
+                name[5:]) if name in fn_dict else None)
+            # args with alternative values are drawn in `draw_args`
+            self.fixed.append({k: v for k, v in args.items()
+                               if not isinstance(v, (list, tuple))})
+            choices = [(k, list(v)) for k, v in args.items()
+                       if isinstance(v, (list, tuple))]
+            if any(len(v) == 0 for _, v in choices):
+                raise ValueError(f"Empty list of alternative args: '{name}'")
+            self.choices.append(choices)
+
+        # probabilities to apply each function
+        self.p = None
+        if all("p" in item for item in settings):
+            self.p = [float(item["p"]) for item in settings]
+            # P(no function is applied), and P(apply the j-th function |
+            # none of the previous ones, but at least one is applied)
+            cond, none = [0.0] * len(self.p), 1.0
+            for j in reversed(range(len(self.p))):
+                none *= 1.0 - self.p[j]
+                cond[j] = self.p[j] / (1.0 - none) if none < 1.0 else 0.0
+            self._gates = (none, cond)
+
+        # weights to pick one of the functions
+        self.cdf = None
+        if len(settings) > 0 and all("weight" in item for item in settings):
+            weights = np.array([item["weight"] for item in settings],
+                               dtype=np.float64)
+            if (weights < 0).any() or weights.sum() <= 0:
+                raise ValueError("The weights must be non-negative, and "
+                                 "at least one weight must be positive")
+            cdf = (weights / weights.sum()).cumsum()
+            cdf /= cdf[-1]
+            self.cdf = cdf
+            self._cdf_list = cdf.tolist()
+
+    def __len__(self) -> int:
+        return len(self.fns)
+
+    def draw_args(self, j: int,
+                  rng: Optional[np.random.Generator] = None) -> dict:
+        """Copy the args of the j-th function, and randomly pick
+            alternative args (see `random_args`)"""
+        cfg = dict(self.fixed[j])
+        for k, v in self.choices[j]:
+            cfg[k] = v[get_rng(rng).integers(0, len(v))]
+        return cfg
+
+    def draw_fn(self, rng: Optional[np.random.Generator] = None) -> int:
+        """Draw the index of one function according to the weights"""
+        return bisect.bisect_right(self._cdf_list, get_rng(rng).random())
+
+    def apply(self, chars: List[str], j: int, cfg: dict,
+              rng: Optional[np.random.Generator] = None) -> List[str]:
+        """Apply the j-th function to a mutable char list
+
+        The edits of a typo function are applied in place, i.e. several
+          typos of one word are joined only once.
+        """
+        if self.edit_fns[j] is None:
+            return list(self.fns[j]("".join(chars), rng=rng, **cfg))
+        return augtxt.typo.apply_edits_inplace(
+            chars, self.edit_fns[j](chars, rng=rng, **cfg))
+
+    def draw_fns(self, size: int,
+                 rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Draw the indices of functions according to the weights"""
+        return self.cdf.searchsorted(get_rng(rng).random(size), side='right')
+
+
+def _resolve_layout(key: str, value):
+    """Lookup the name of a keymap, transition probabilities, or key
+        geometry (e.g. in JSON settings) in `augtxt.keyboard_layouts`"""
+    if key not in ("keymap", "trans", "geometry"):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_resolve_layout(key, v) for v in value]
+    if isinstance(value, str):
+        layout = getattr(kbl, value, None)
+        if not isinstance(layout, dict):
+            raise ValueError(f"Unknown {key} in keyboard_layouts: '{value}'")
+        return layout
+    return value
+
+
+def _as_plan(settings: Union[List[dict], AugmentationPlan],
+             require: str) -> AugmentationPlan:
+    """Compile raw settings, and check that `p` or `cdf` exists"""
+    plan = settings if isinstance(settings, AugmentationPlan) \
+        else AugmentationPlan(settings)
+    if getattr(plan, require) is None:
+        key = "p" if require == "p" else "weight"
+        raise ValueError(f"Each setting requires a '{key}'")
+    return plan
+
+
+def _check_cache(settings, cache):
+    """The cache is keyed by the plan, i.e. raw settings never hit"""
+    if cache is not None and not isinstance(settings, AugmentationPlan):
+        raise ValueError("A TypoCache requires the settings as "
+                         "AugmentationPlan")
+
+
+def wordtypo(original: str,
+             settings: Union[List[dict], AugmentationPlan],
+             rng: Optional[np.random.Generator] = None,
+             cache: Optional["TypoCache"] = None) -> str:
     """Apply different augmentation functions to one word
 
     Parameters:
     -----------
     original : str
 
-    settings : List[dict]
+    settings : Union[List[dict], AugmentationPlan]
+        Raw settings are compiled on each call. Pass an `AugmentationPlan`
+          to compile them only once.
+
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
+    cache : TypoCache  (Default: None)
+        Draw the variant from the cached distribution of the word. The
+          settings must be an `AugmentationPlan`.
 
     Return:
     -------
@@ -62,34 +236,398 @@ def wordtypo(original: str, settings: List[dict]) -> str:
 
         Counter(results)
     """
-    result = copy.copy(original)
+    _check_cache(settings, cache)
+    plan = _as_plan(settings, "p")
+    if cache is not None:
+        return cache.draw(original, plan, "wordtypo", rng=rng)
+    chars = None
     # loop over all augmentation methods in random order
-    for i in np.random.permutation(len(settings)):
+    for i in get_rng(rng).permutation(len(plan)):
         # apply augmentation with a given probability
-        if settings[i]['p'] >= scipy.stats.uniform.rvs():
+        if plan.p[i] >= get_rng(rng).random():
             # read fn args and randomly pick alternative args
-            cfg = random_args(settings[i]['args'])
-            # augment the word
-            result = fn_dict[settings[i]['fn']](result, **cfg)
+            cfg = plan.draw_args(i, rng=rng)
+            # augment the word (the chars are joined only once)
+            if chars is None:
+                chars = list(original)
+            chars = plan.apply(chars, i, cfg, rng=rng)
     # next
+    return original if chars is None else "".join(chars)
+
+
+def wordtypo_batch(words: List[str],
+                   settings: Union[List[dict], AugmentationPlan],
+                   rng: Optional[np.random.Generator] = None) -> List[str]:
+    """Apply `wordtypo` to a sequence of words with vectorized draws
+
+    Which functions are applied to which word is drawn for all words at
+      once, i.e. one `(num_words, num_functions)` array of uniforms. The
+      order of the applied functions is drawn only for the words that
+      change. The typo functions are called only for these words.
+
+    The results have the same distribution as calling `wordtypo` for each
+      word but a different random stream.
+
+    Parameters:
+    -----------
+    words : List[str]
+        A list of word tokens, e.g. a tokenized sentence
+
+    settings : Union[List[dict], AugmentationPlan]
+        see `wordtypo`
+
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
+    Return:
+    -------
+    List[str]
+        The augmented variants of the input words
+
+    Example:
+    --------
+        from augtxt.augmenters import wordtypo_batch
+        tokenseq = ["Dies", "ist", "ein", "Satz", "."]
+        augm = wordtypo_batch(tokenseq, settings)
+    """
+    plan = _as_plan(settings, "p")
+    result = [str(w) for w in words]
+    if len(result) == 0 or len(plan) == 0:
+        return result
+
+    # draw all applied/not applied decisions at once
+    u = get_rng(rng).random((len(result), len(plan)))
+    mask = u <= np.array(plan.p)
+    changed = np.where(mask.any(axis=1))[0]
+    if len(changed) == 0:
+        return result
+
+    # random order of the functions for the changed words
+    keys = get_rng(rng).random((len(changed), len(plan)))
+    orders = np.argsort(keys, axis=1)
+    for k, order in zip(changed.tolist(), orders.tolist()):
+        chars = list(result[k])
+        for i in order:
+            if mask[k, i]:
+                cfg = plan.draw_args(i, rng=rng)
+                chars = plan.apply(chars, i, cfg, rng=rng)
+        result[k] = "".join(chars)
     return result
 
 
-def senttypo(original: str,
-             settings: List[dict],
+def typo_variants(word: str,
+                  settings: Union[List[dict], AugmentationPlan]
+                  ) -> Dict[str, float]:
+    """Enumerate all variants of a word that one typo of `senttypo` can
+        produce, and their exact probabilities
+
+    One function is picked according to the settings' weights, and each
+      alternative arg with equal probability (see `senttypo`). The
+      variants of each function are enumerated with `augtxt.typo.variants`
+      instead of drawing many random samples.
+
+    Parameters:
+    -----------
+    word : str
+        One word token
+
+    settings : Union[List[dict], AugmentationPlan]
+        The 'typo.*' settings with a 'weight' each (see `senttypo`)
+
+    Return:
+    -------
+    Dict[str, float]
+        The distinct variants and their probabilities (sorted by
+          probability). The probabilities sum up to 1.
+
+    Example:
+    --------
+        from augtxt.augmenters import typo_variants
+        settings = [
+            {'weight': 2, 'fn': 'typo.drop_n_next_twice',
+             'args': {'loc': ['m', 'e'], 'keep_case': True}},
+            {'weight': 1, 'fn': 'typo.swap_consecutive',
+             'args': {'loc': ['m', 'e'], 'keep_case': True}}]
+        typo_variants("Satz", settings)
+        # {'Sazz': 0.353..., 'Sttz': 0.226..., 'Sazt': 0.176..., ...}
+    """
+    plan = _as_plan(settings, "cdf")
+    probs = {}
+    prev = 0.0
+    for j, c in enumerate(plan._cdf_list):
+        pj, prev = c - prev, c
+        if pj <= 0.0:
+            continue
+        for res, pv in _fn_variants(word, plan, j).items():
+            probs[res] = probs.get(res, 0.0) + pj * pv
+    return dict(sorted(probs.items(), key=lambda kv: -kv[1]))
+
+
+def _fn_variants(word: str, plan: AugmentationPlan,
+                 j: int) -> Dict[str, float]:
+    """The variants of the j-th typo function incl. its alternative args"""
+    if plan.names[j] not in fn_dict:
+        raise ValueError(f"Not a typo function: '{plan.names[j]}'")
+    # each combination of alternative args is equally likely
+    keys = [k for k, _ in plan.choices[j]]
+    combos = list(itertools.product(*[v for _, v in plan.choices[j]]))
+    probs = {}
+    for values in combos:
+        cfg = {**plan.fixed[j], **dict(zip(keys, values))}
+        for res, pv in augtxt.typo.variants(
+                word, plan.fns[j], **cfg).items():
+            probs[res] = probs.get(res, 0.0) + pv / len(combos)
+    return probs
+
+
+def wordtypo_variants(word: str,
+                      settings: Union[List[dict], AugmentationPlan],
+                      tol: float = 0.0) -> Dict[str, float]:
+    """Enumerate all variants of a word that `wordtypo` can produce, and
+        their exact probabilities
+
+    `wordtypo` applies each function with its probability `p` in random
+      order, i.e. each subset of functions is applied with the product of
+      their probabilities, and in each order with equal probability. The
+      variants of each ordered subset are computed forward, and the
+      variants of each (word, function) only once.
+
+    Parameters:
+    -----------
+    word : str
+        One word token
+
+    settings : Union[List[dict], AugmentationPlan]
+        The 'typo.*' settings with a 'p' each (see `wordtypo`)
+
+    tol : float  (Default: 0.0)
+        Drop subsets of functions and intermediate variants whose
+          probability is below `tol`, e.g. 1e-9 for many functions
+
+    Return:
+    -------
+    Dict[str, float]
+        The distinct variants and their probabilities (sorted by
+          probability)
+
+    Example:
+    --------
+        from augtxt.augmenters import wordtypo_variants
+        settings = [
+            {'p': 0.04, 'fn': 'typo.drop_n_next_twice',
+             'args': {'loc': ['m', 'e'], 'keep_case': True}},
+            {'p': 0.04, 'fn': 'typo.swap_consecutive',
+             'args': {'loc': ['m', 'e'], 'keep_case': True}}]
+        wordtypo_variants("Satz", settings)
+        # {'Satz': 0.9216, 'Sazz': 0.0205..., 'Sazt': 0.0203..., ...}
+    """
+    plan = _as_plan(settings, "p")
+    n = len(plan)
+    # memorize the variants of each (word, function)
+    memo = {}
+    probs = {}
+    # the applied functions are a random subset, and each order of the
+    # subset is equally likely
+    for k in range(n + 1):
+        for subset in itertools.combinations(range(n), k):
+            ps = 1.0
+            for j in range(n):
+                ps *= plan.p[j] if j in subset else 1.0 - plan.p[j]
+            if ps <= tol:
+                continue
+            orders = list(itertools.permutations(subset))
+            for order in orders:
+                dist = {word: ps / len(orders)}
+                for j in order:
+                    nxt = {}
+                    for w, pw in dist.items():
+                        if (w, j) not in memo:
+                            memo[(w, j)] = _fn_variants(w, plan, j)
+                        for res, pv in memo[(w, j)].items():
+                            pr = pw * pv
+                            if pr > tol:
+                                nxt[res] = nxt.get(res, 0.0) + pr
+                    dist = nxt
+                for w, pw in dist.items():
+                    probs[w] = probs.get(w, 0.0) + pw
+    return dict(sorted(probs.items(), key=lambda kv: -kv[1]))
+
+
+class TypoCache(object):
+    """LRU cache of the typo variants of frequent words
+
+    The variants and the cumulative probabilities of each (word,
+      settings) are computed once (see `typo_variants`). Augmenting a
+      cached word with `senttypo` is one uniform draw and a binary search.
+
+    `wordtypo` draws with one uniform if any function is applied at all
+      (the common case for small `p` is that none is), then the applied
+      functions, and the first typo from the cached variants of the word.
+      Further typos on an already modified word are rare, and computed by
+      the typo functions.
+
+    The results have the same distribution as without cache but a
+      different random stream.
+
+    Parameters:
+    -----------
+    maxsize : int  (Default: 10000)
+        The maximum number of cached (word, settings) entries. The least
+          recently used entry is evicted first.
+
+    Attributes:
+    -----------
+    hits, misses : int
+        The number of lookups that were (not) in the cache
+
+    Example:
+    --------
+        from augtxt.augmenters import AugmentationPlan, TypoCache, senttypo
+        plan = AugmentationPlan(settings)
+        cache = TypoCache(maxsize=5000)
+        cache.warm(most_frequent_words, plan)
+        augm = senttypo('Die Lehrerin [MASK] einen Roman.', plan,
+                        cache=cache)
+    """
+    def __init__(self, maxsize: int = 10000):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._tables = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def clear(self):
+        """Remove all entries, and reset the counters"""
+        self._tables.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def table(self, word: str,
+              plan: AugmentationPlan,
+              mode: str = "senttypo"):
+        """The variants of a word and their cumulative probabilities
+
+        Parameters:
+        -----------
+        word : str
+            One word token
+
+        plan : AugmentationPlan
+            The compiled settings
+
+        mode : str  (Default: "senttypo")
+            "senttypo" (one typo function picked by weight), or "wordtypo"
+              (each function applied with probability `p`)
+
+        Return:
+        -------
+        Tuple[List[str], List[float]]
+            "senttypo": The variants and their cumulative probabilities
+
+        List[Tuple[List[str], List[float]]]
+            "wordtypo": The same for each function
+        """
+        key = (word, id(plan), mode)
+        entry = self._tables.get(key)
+        if entry is not None and entry[0] is plan:
+            self.hits += 1
+            self._tables.move_to_end(key)
+            return entry[1]
+
+        self.misses += 1
+        if mode == "senttypo":
+            table = _cdf_table(typo_variants(word, plan))
+        elif mode == "wordtypo":
+            _as_plan(plan, "p")
+            table = [_cdf_table(_fn_variants(word, plan, j))
+                     for j in range(len(plan))]
+        else:
+            raise ValueError(f"Unknown mode: '{mode}'")
+        # keep a reference to `plan` to detect a reused id
+        self._tables[key] = (plan, table)
+        if len(self._tables) > self.maxsize:
+            self._tables.popitem(last=False)
+        return table
+
+    def draw(self, word: str,
+             plan: AugmentationPlan,
+             mode: str = "senttypo",
+             rng: Optional[np.random.Generator] = None) -> str:
+        """Draw one variant of a word (see `senttypo`, `wordtypo`)"""
+        if mode == "wordtypo":
+            return self._draw_wordtypo(word, plan, rng)
+        variants, cdf = self.table(word, plan, mode)
+        return variants[bisect.bisect_right(cdf, get_rng(rng).random())]
+
+    def _draw_wordtypo(self, word: str, plan: AugmentationPlan, rng):
+        p = _as_plan(plan, "p").p
+        # P(no function is applied), and P(a function is applied | none
+        # of the previous ones, but at least one function is applied)
+        pnone, cond = plan._gates
+        if get_rng(rng).random() < pnone:
+            return word
+        table = self.table(word, plan, "wordtypo")
+        u = get_rng(rng).random(len(plan))
+        applied, first = [], True
+        for j in range(len(plan)):
+            if u[j] < (cond[j] if first else p[j]):
+                applied.append(j)
+                first = False
+        # apply in random order, the first typo from the cache
+        chars = None
+        for k, j in enumerate(get_rng(rng).permutation(applied)):
+            if k == 0:
+                variants, cdf = table[j]
+                idx = bisect.bisect_right(cdf, get_rng(rng).random())
+                chars = list(variants[idx])
+            else:
+                cfg = plan.draw_args(j, rng=rng)
+                chars = plan.apply(chars, j, cfg, rng=rng)
+        return word if chars is None else "".join(chars)
+
+    def warm(self, words: Iterable[str],
+             plan: AugmentationPlan,
+             mode: str = "senttypo"):
+        """Pre-compute the variants of words, e.g. of the `maxsize` most
+            frequent words of a corpus in descending order"""
+        for word in itertools.islice(words, self.maxsize):
+            self.table(word, plan, mode)
+
+
+def _cdf_table(probs: Dict[str, float]) -> Tuple[List[str], List[float]]:
+    """Variants and their normalized cumulative probabilities"""
+    cdf = np.cumsum(list(probs.values()))
+    return list(probs.keys()), (cdf / cdf[-1]).tolist()
+
+
+def senttypo(original: Union[str, List[str],
+                             augtxt.tokenizer.TokenizedSentence],
+             settings: Union[List[dict], AugmentationPlan],
              exclude: List[str] = None,
              num_augmentations: int = 1,
-             pmax: float = 0.1) -> List[str]:
+             pmax: float = 0.1,
+             rng: Optional[np.random.Generator] = None,
+             cache: Optional[TypoCache] = None
+             ) -> Union[List[str], List[List[str]]]:
     """ Apply different augmentation functions to at least one word or up
           a certain percentage of words in a sentence
 
     Parameters:
     -----------
-    original : str
-        The original sentence as string. If a List[str] it is assumed to be
-          pretokenized.
+    original : Union[str, List[str], TokenizedSentence]
+        The original sentence as string, tokenized with
+          `augtxt.tokenizer.tokenize`, or pretokenized as list of tokens.
+          Pretokenized sentences are not tokenized again, and tokens of
+          punctuation chars only are not augmented.
 
-    settings : List[dict]
+    settings : Union[List[dict], AugmentationPlan]
+        Raw settings are compiled on each call. Pass an `AugmentationPlan`
+          to compile them only once.
 
     exclude : List[str]
         List of strings that are excluded from augmentation
@@ -100,10 +638,19 @@ def senttypo(original: str,
     pmax : float (default 0.1)
         The maximum percentage of words per sentence to augment
 
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
+    cache : TypoCache  (Default: None)
+        Draw the variants of each word from their cached distribution.
+          The settings must be an `AugmentationPlan`.
+
     Return:
     -------
-    List[str]
-        The augmented variant of the input sentence
+    Union[List[str], List[List[str]]]
+        The augmented variants of the input sentence (a token list each
+          if the input was pretokenized)
 
     Example:
     --------
@@ -123,8 +670,11 @@ def senttypo(original: str,
 
         augm = senttypo(original, settings=settings, exclude=exclude, 2, 0.1)
     """
-    # tokenization
-    token = [t for t in re.split('[ .,;:!?]', original) if len(t) > 0]
+    _check_cache(settings, cache)
+
+    # tokenization with char offsets (or pretokenized words)
+    sent = augtxt.tokenizer.tokenize(original)
+    token = sent.tokens
 
     # number of words to augment
     num_aug = max(int(len(token) * pmax), 1)
@@ -137,28 +687,27 @@ def senttypo(original: str,
     if len(indicies) == 0:
         return []
 
-    # extract settings for shuffling
-    fns = [item.get("fn") for item in settings]
-    configs = [item.get("args") for item in settings]
-    weights = np.array([item.get("weight") for item in settings])
-    p = weights / weights.sum()
+    # compile settings
+    plan = _as_plan(settings, "cdf")
 
     augmentations = []
     for _ in range(num_augmentations):
-        augsent = copy.copy(original)
+        augwords = {}
         # draw random tokens
-        selected = np.random.choice(indicies, size=num_aug)
+        selected = get_rng(rng).choice(indicies, size=num_aug)
         # loop over selected tokens to augment them
         for i in selected:
+            word = augwords.get(i, token[i])
+            if cache is not None:
+                augwords[i] = cache.draw(word, plan, rng=rng)
+                continue
             # get random augmentation function
-            j = np.random.choice(range(len(p)), size=1, replace=False, p=p)[0]
-            cfg = random_args(configs[j])
-            # augment the choosen token
-            augword = fn_dict[fns[j]](token[i], **cfg)
-            # replace original word with augmented word
-            augsent = augsent.replace(token[i], augword, 1)
-        # save augmented sentence
-        augmentations.append(augsent)
+            j = plan.draw_fn(rng=rng)
+            cfg = plan.draw_args(j, rng=rng)
+            # augment the choosen token (again if drawn twice)
+            augwords[i] = plan.fns[j](word, rng=rng, **cfg)
+        # replace the original words at their offsets
+        augmentations.append(sent.rebuild(augwords))
     # done
     return augmentations
 
@@ -171,8 +720,47 @@ fn_dict2 = {
 }
 
 
-def sentaugm(sentence, settings, exclude=["[MASK]"]):
+def compile_sentaugm_settings(settings: dict) -> dict:
+    """Compile the "typo" and "order" settings of `sentaugm` into
+        `AugmentationPlan` objects
+
+    Example:
+    --------
+        settings = compile_sentaugm_settings(settings)
+        augs = [sentaugm(s, settings) for s in sentences]
     """
+    compiled = dict(settings)
+    for key, require in (("typo", "cdf"), ("order", "cdf")):
+        if compiled.get(key):
+            cfg = dict(compiled[key])
+            cfg["settings"] = _as_plan(cfg.get("settings"), require)
+            compiled[key] = cfg
+    return compiled
+
+
+def sentaugm(sentence, settings, exclude=["[MASK]"], rng=None,
+             max_retries=1, return_stats=False):
+    """Apply typographical, interpunctation, and word order errors to
+        a sentence
+
+    Each family ("typo", "punct", "order") draws as many augmentations as
+      it still misses. Duplicates and unchanged sentences are skipped.
+      Only the families that are still short are retried up to
+      `max_retries` times, i.e. fewer than the requested number of
+      augmentations might be returned.
+
+    If `return_stats=True`, the number of "draws", "wasted" draws
+      (duplicates, unchanged), and "missing" augmentations per family
+      are returned as well, i.e. `augs, stats = sentaugm(...)`
+
+    The "typo" and "order" settings are compiled on each call. Use
+      `compile_sentaugm_settings` to compile them only once.
+
+    If `rng` (a `np.random.Generator`) is None, the global `np.random`
+      state is used.
+
+    The sentence must be a string (or a `TokenizedSentence`). Pretokenized
+      token lists raise a ValueError.
 
     Example:
     --------
@@ -212,40 +800,221 @@ def sentaugm(sentence, settings, exclude=["[MASK]"]):
     sentence = 'Die Lehrerin [MASK] einen Roman.'
     augs = sentaugm(sentence, settings, exclude)
     """
-    augs = []
-    req_num = sum([v.get("num_augmentations") for _, v in settings.items()])
-    for _ in range(2):
-        # typographical errors
-        if settings.get("typo"):
-            augs.extend(augtxt.augmenters.senttypo(
-                sentence, exclude=exclude, **settings.get("typo")))
-
-        # interpunctation errors
-        if settings.get("punct"):
-            cfg = settings.get("punct")
-            if cfg.get("num_augmentations", 0) > 0:
-                augs.append(augtxt.punct.remove_syntaxinfo(sentence))
-            if cfg.get("num_augmentations", 0) > 1:
-                for _ in range(1, cfg.get("num_augmentations", 0)):
-                    augs.append(augtxt.punct.merge_words(sentence, num_aug=1))
-
-        # word order errors
-        if settings.get("order"):
-            cfg = settings.get("order")
-            weights = np.array([item.get('weight') for item
-                                in cfg.get("settings")])
-            p = weights / weights.sum()
-            idx = np.random.choice(range(len(p)),
-                                   size=cfg.get("num_augmentations"),
-                                   replace=True, p=p)
-            for i in idx:
-                fname = cfg.get("settings")[i].get('fn')
-                augs.append(fn_dict2[fname](
-                    sentence, exclude=exclude, num_aug=1))
+    # the punctuation errors edit the raw string
+    if isinstance(sentence, augtxt.tokenizer.TokenizedSentence):
+        sentence = sentence.text
+    elif not isinstance(sentence, str):
+        raise ValueError(
+            "sentaugm requires a sentence string. Pretokenized token lists "
+            "are only supported by senttypo and augtxt.order.")
+
+    # compile settings once for all rounds
+    settings = compile_sentaugm_settings(settings)
+
+    # tokenize once for all augmenters
+    sent = augtxt.tokenizer.tokenize(sentence)
+
+    # the number of missing augmentations of each family
+    families = [key for key in ("typo", "punct", "order")
+                if settings.get(key)]
+    missing = {key: settings[key].get("num_augmentations", 0)
+               for key in families}
+    stats = {"draws": {key: 0 for key in families},
+             "wasted": {key: 0 for key in families}}
+
+    # ordered set of unique augmentations
+    augs = {}
+    for r in range(max_retries + 1):
+        for key in families:
+            if missing[key] <= 0:
+                continue
+            for aug in _draw_family(key, missing[key], sentence, sent,
+                                    settings[key], exclude, r, rng):
+                stats["draws"][key] += 1
+                # skip duplicates, and unchanged sentences
+                if aug in augs or aug == sentence:
+                    stats["wasted"][key] += 1
+                else:
+                    augs[aug] = None
+                    missing[key] -= 1
         # done?
-        if len(set(augs)) >= req_num:
+        if all(num <= 0 for num in missing.values()):
             break
-    # filter duplicates
-    augs = list(set(augs))
-    # chop excess
-    return augs[:req_num]
+
+    augs = list(augs)
+    if return_stats:
+        stats["missing"] = {key: max(0, num) for key, num in missing.items()}
+        return augs, stats
+    return augs
+
+
+def _draw_family(key: str, num: int, sentence: str,
+                 sent: augtxt.tokenizer.TokenizedSentence,
+                 cfg: dict, exclude: List[str], r: int,
+                 rng: Optional[np.random.Generator] = None) -> List[str]:
+    """Draw `num` augmentations of one family of `sentaugm`"""
+    # typographical errors
+    if key == "typo":
+        cfg = dict(cfg)
+        cfg["num_augmentations"] = num
+        return senttypo(sent, exclude=exclude, rng=rng, **cfg)
+
+    # interpunctation errors (removing all punctuation is deterministic,
+    #   i.e. it's only tried in the 1st round)
+    if key == "punct":
+        augs = []
+        if r == 0:
+            augs.append(augtxt.punct.remove_syntaxinfo(sent))
+        while len(augs) < num:
+            augs.append(augtxt.punct.merge_words(
+                sentence, num_aug=1, rng=rng))
+        return augs
+
+    # word order errors
+    if key == "order":
+        plan = cfg["settings"]
+        return [plan.fns[i](sent, exclude=exclude, num_aug=1, rng=rng)
+                for i in plan.draw_fns(num, rng=rng)]
+
+    return []
+
+
+def _augment_sentence(method: str, sentence: str, settings, exclude,
+                      num: int, rng) -> List[str]:
+    """Augment one sentence of a document (see `docaugm`)"""
+    if method == "sentaugm":
+        return sentaugm(sentence, settings, exclude, rng=rng)
+    augs = senttypo(sentence, settings, exclude=exclude,
+                    num_augmentations=num, rng=rng)
+    # skip duplicates, and unchanged sentences
+    return [aug for aug in dict.fromkeys(augs) if aug != sentence]
+
+
+def _augment_sentences(job: tuple) -> List[List[str]]:
+    """Augment a chunk of sentences of a document, i.e. the settings are
+        sent once per chunk (see `docaugm`)"""
+    method, settings, exclude, seed, items = job
+    return [_augment_sentence(method, sentence, settings, exclude, num,
+                              shard_rng(seed, i))
+            for i, sentence, num in items]
+
+
+def docaugm(document: str,
+            settings: Union[dict, List[dict], AugmentationPlan],
+            exclude: List[str] = ["[MASK]"],
+            num_augmentations: int = 1,
+            budget: Optional[int] = 1,
+            method: str = "sentaugm",
+            executor=None,
+            seed: Optional[Union[int, np.random.SeedSequence]] = None,
+            chunksize: int = 32
+            ) -> List[str]:
+    """Augment a document sentence by sentence
+
+    The document is segmented into sentences once (see
+      `augtxt.tokenizer.segment`). For each augmented document, `budget`
+      random sentences are replaced by one of their augmentations. Only
+      these sentences are augmented, each with its own random stream,
+      i.e. the results are the same with or without `executor`. The
+      augmented documents are joined from the original document and the
+      augmented sentences, i.e. the original spacing is kept.
+
+    Parameters:
+    -----------
+    document : str
+        The document
+
+    settings : Union[dict, List[dict], AugmentationPlan]
+        The settings of `sentaugm` or `senttypo` (see `method`). They are
+          compiled once for all sentences.
+
+    exclude : List[str]
+        List of strings that are excluded from augmentation
+
+    num_augmentations : int  (Default: 1)
+        Number of augmented documents
+
+    budget : int  (Default: 1)
+        The number of augmented sentences per augmented document. If None,
+          all sentences are augmented.
+
+    method : str  (Default: "sentaugm")
+        The sentence augmenter "sentaugm" or "senttypo"
+
+    executor : concurrent.futures.Executor  (Default: None)
+        A thread or process pool to augment the sentences in parallel. If
+          None, the sentences are augmented in the current thread.
+
+    seed : Union[int, np.random.SeedSequence]  (Default: None)
+        The root seed of the random streams
+
+    chunksize : int  (Default: 32)
+        The number of sentences per `executor` task. The compiled settings
+          are sent once per task.
+
+    Return:
+    -------
+    List[str]
+        The augmented documents. A sentence without any augmentation is
+          kept as it is.
+
+    Example:
+    --------
+        from augtxt.augmenters import docaugm
+        import concurrent.futures
+        document = ("Die Lehrerin [MASK] einen Roman. "
+                    "Die Schülerin [MASK] einen Aufsatz.")
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            augs = docaugm(document, settings, num_augmentations=3,
+                           executor=executor, seed=42)
+    """
+    if method == "sentaugm":
+        settings = compile_sentaugm_settings(settings)
+    elif method == "senttypo":
+        settings = _as_plan(settings, "cdf")
+    else:
+        raise ValueError(f"Unknown method: '{method}'")
+
+    spans = augtxt.tokenizer.segment(document)
+    if len(spans) == 0:
+        return []
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+
+    # pick the sentences of each augmented document
+    n = len(spans)
+    size = n if budget is None else max(0, min(budget, n))
+    rng = np.random.default_rng(seed)
+    picked = [np.sort(rng.choice(n, size=size, replace=False)).tolist()
+              for _ in range(num_augmentations)]
+    counts = collections.Counter([i for idx in picked for i in idx])
+
+    # augment each picked sentence once (in chunks)
+    indices = sorted(counts)
+    items = [(i, document[spans[i][0]:spans[i][1]], counts[i])
+             for i in indices]
+    jobs = [(method, settings, exclude, seed, items[k:(k + chunksize)])
+            for k in range(0, len(items), max(1, chunksize))]
+    if executor is None:
+        results = map(_augment_sentences, jobs)
+    else:
+        results = executor.map(_augment_sentences, jobs)
+    sentaugs = dict(zip(indices, itertools.chain.from_iterable(results)))
+
+    # join the original document and the augmented sentences
+    used = collections.Counter()
+    documents = []
+    for idx in picked:
+        pieces, prev = [], 0
+        for i in idx:
+            augs = sentaugs[i]
+            if len(augs) == 0:
+                continue
+            start, end = spans[i]
+            pieces.append(document[prev:start])
+            pieces.append(augs[used[i] % len(augs)])
+            used[i] += 1
+            prev = end
+        pieces.append(document[prev:])
+        documents.append("".join(pieces))
+    return documents
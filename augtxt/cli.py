@@ -0,0 +1,162 @@
+from typing import Iterator, List, Optional
+import argparse
+import json
+import sys
+import numpy as np
+import augtxt.augmenters
+
+
+def load_settings(path: str):
+    """Read the settings from a JSON or YAML file
+
+    YAML files (`.yml`, `.yaml`) require the optional `PyYAML` package.
+    """
+    with open(path, "r", encoding="utf-8") as fp:
+        if path.endswith((".yml", ".yaml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(
+                    "Install PyYAML to read YAML settings: pip install pyyaml")
+            return yaml.safe_load(fp)
+        return json.load(fp)
+
+
+def read_sentences(fp, fmt: str = "text", field: str = "text",
+                   column: int = 0) -> Iterator[str]:
+    """Read one sentence per line from a text, JSONL, or TSV stream"""
+    for line in fp:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        if fmt == "jsonl":
+            yield json.loads(line)[field]
+        elif fmt == "tsv":
+            yield line.split("\t")[column]
+        else:
+            yield line
+
+
+def compile_method(method: str, settings, exclude: List[str],
+                   num_augmentations: int):
+    """Compile the settings once, and return a function that augments one
+        sentence (or word) with a given `rng`"""
+    if method == "sentaugm":
+        settings = augtxt.augmenters.compile_sentaugm_settings(settings)
+        return lambda s, rng: augtxt.augmenters.sentaugm(
+            s, settings, exclude, rng=rng)
+
+    # a plain list of settings, or a dict with further arguments
+    kwargs = dict(settings) if isinstance(settings, dict) \
+        else {"settings": settings}
+    if method == "senttypo":
+        kwargs["settings"] = augtxt.augmenters.AugmentationPlan(
+            kwargs["settings"])
+        kwargs.setdefault("num_augmentations", num_augmentations)
+        return lambda s, rng: augtxt.augmenters.senttypo(
+            s, exclude=exclude, rng=rng, **kwargs)
+
+    if method == "wordtypo":
+        plan = augtxt.augmenters.AugmentationPlan(kwargs["settings"])
+        num = kwargs.get("num_augmentations", num_augmentations)
+        return lambda s, rng: augtxt.augmenters.wordtypo_batch(
+            [s] * num, plan, rng=rng)
+
+    raise ValueError(f"Unknown method: '{method}'")
+
+
+def format_row(original: str, augmentations: List[str], fmt: str) -> str:
+    """Format the augmentations of one sentence as output line(s)"""
+    if fmt == "tsv":
+        return "".join([f"{original}\t{aug}\n" for aug in augmentations])
+    return json.dumps({"original": original,
+                       "augmentations": augmentations},
+                      ensure_ascii=False) + "\n"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """The `augtxt` console script
+
+    Example:
+    --------
+        cat sentences.txt | augtxt -s settings.json > augmented.jsonl
+        augtxt -s settings.yaml -m senttypo --input-format jsonl in.jsonl
+    """
+    parser = argparse.ArgumentParser(
+        prog="augtxt",
+        description=("Augment one sentence (or word) per line, and write "
+                     "the original and its augmentations as JSONL or TSV."))
+    parser.add_argument(
+        "input", nargs="?", default="-",
+        help="Input file (Default: '-', i.e. stdin)")
+    parser.add_argument(
+        "-s", "--settings", required=True,
+        help="JSON or YAML file with the settings of the method")
+    parser.add_argument(
+        "-m", "--method", default="sentaugm",
+        choices=["sentaugm", "senttypo", "wordtypo"],
+        help="The augmentation pipeline (Default: sentaugm)")
+    parser.add_argument(
+        "-o", "--output", default="-",
+        help="Output file (Default: '-', i.e. stdout)")
+    parser.add_argument(
+        "--input-format", default="text", choices=["text", "jsonl", "tsv"],
+        help="Format of the input lines (Default: text)")
+    parser.add_argument(
+        "--field", default="text",
+        help="The JSON key of the sentence (Default: text)")
+    parser.add_argument(
+        "--column", type=int, default=0,
+        help="The TSV column of the sentence (Default: 0)")
+    parser.add_argument(
+        "--output-format", default="jsonl", choices=["jsonl", "tsv"],
+        help="Format of the output lines (Default: jsonl)")
+    parser.add_argument(
+        "-e", "--exclude", action="append", default=None,
+        help="String excluded from augmentation (Default: [MASK])")
+    parser.add_argument(
+        "-n", "--num-augmentations", type=int, default=1,
+        help=("Number of augmentations (senttypo, wordtypo) if not set in "
+              "the settings file (Default: 1)"))
+    parser.add_argument(
+        "--seed", type=int, default=None,
+        help="Seed of the random number generator")
+    parser.add_argument(
+        "--buffer-size", type=int, default=1000,
+        help="Number of input lines per bulk write (Default: 1000)")
+    args = parser.parse_args(argv)
+
+    settings = load_settings(args.settings)
+    exclude = ["[MASK]"] if args.exclude is None else args.exclude
+    augment = compile_method(
+        args.method, settings, exclude, args.num_augmentations)
+    rng = np.random.default_rng(args.seed)
+
+    fin = sys.stdin if args.input == "-" \
+        else open(args.input, "r", encoding="utf-8")
+    fout = sys.stdout if args.output == "-" \
+        else open(args.output, "w", encoding="utf-8")
+    try:
+        buffer = []
+        for sentence in read_sentences(
+                fin, args.input_format, args.field, args.column):
+            buffer.append(format_row(
+                sentence, augment(sentence, rng), args.output_format))
+            if len(buffer) >= args.buffer_size:
+                fout.write("".join(buffer))
+                buffer = []
+        fout.write("".join(buffer))
+        fout.flush()
+    except BrokenPipeError:
+        # e.g. `augtxt ... | head`
+        pass
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout:
+            fout.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,321 @@
+from typing import Optional, Tuple, Union
+import bisect
+import collections
+import threading
+import numpy as np
 
-def find_index(c: str, keymap: dict) -> (int, str):
+
+class _IdentityCache(object):
+    """Bounded LRU cache keyed by object identity
+
+    The keymap, `trans`, and geometry dicts cannot be weakly referenced.
+      Thus, a cached object is referenced by its entry (i.e. its id is not
+      reused while it's cached), and the least recently used entries are
+      dropped beyond `maxsize`. Dicts built on each call do not leak.
+
+    Parameters:
+    -----------
+    maxsize : int  (Default: 32)
+        The maximum number of entries
+    """
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, obj, extra: tuple = ()):
+        """The cached value of `obj` (and `extra` args), or None"""
+        key = (id(obj),) + extra
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] is not obj:
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, obj, value, extra: tuple = ()):
+        """Cache the value of `obj` (and `extra` args)"""
+        key = (id(obj),) + extra
+        with self._lock:
+            self._data[key] = (obj, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+
+class CompiledKeymap(object):
+    """Reverse index and dense state x key table of a keymap
+
+    Parameters:
+    -----------
+    keymap : dict
+        A dictionary with four keyboard states as keys ("keys", "shift",
+          "alt", "shift+alt"). Each key stores a list of characters.
+
+    Attributes:
+    -----------
+    states : tuple
+        The keyboard states in the order of the keymap
+
+    index : dict
+        char -> (key index, state index). If a char occurs more than once,
+          the 1st occurrence is stored (see `find_index`).
+
+    table : List[List[str]]
+        `table[state][idx]` is the char of key `idx` in a given state
+
+    Examples:
+    ---------
+        km = compile_keymap(macbook_us)
+        idx, state = km.index["h"]
+        km.table[1][idx]
+        # 'H'
+    """
+    def __init__(self, keymap: dict):
+        self.keymap = keymap
+        self.states = tuple(keymap.keys())
+        self.table = [list(keymap[state]) for state in self.states]
+        self.index = {}
+        for s, chars in enumerate(self.table):
+            for idx, c in enumerate(chars):
+                self.index.setdefault(c, (idx, s))
+        self._cdfs = _IdentityCache()
+        self._adjacency = _IdentityCache()
+
+    def find(self, c: str) -> (int, str):
+        """Find the key index and keyboard state of a char"""
+        idx, s = self.index.get(c, (None, None))
+        if idx is None:
+            return None, None
+        return idx, self.states[s]
+
+    def transition_cdf(self, trans: dict) -> np.ndarray:
+        """Cumulative transition probabilities as state x state array
+
+        Each row is normalized the same way as `np.random.choice` does,
+          i.e. drawing `u ~ U[0,1)` and counting the entries `<= u` gives
+          the same new state as `np.random.choice(4, p=trans[state])`.
+        """
+        return self._transition_cdfs(trans)[0]
+
+    def transition_cdf_list(self, trans: dict) -> list:
+        """Same as `transition_cdf` but as nested Python lists"""
+        return self._transition_cdfs(trans)[1]
+
+    def sample_states(self, trans: dict, states, u) -> np.ndarray:
+        """Draw a new keyboard state for each state with one search per row
+
+        Parameters:
+        -----------
+        trans : dict
+            The transition probabilities (see `keyboard_transprob`)
+
+        states : array-like
+            State indices
+
+        u : np.ndarray
+            Uniform random numbers from [0, 1), one for each state
+
+        Return:
+        -------
+        np.ndarray
+            The new state indices. For each pair, the result is the same
+              as `bisect.bisect_right(transition_cdf_list(trans)[s], u)`.
+        """
+        cdf = self.transition_cdf(trans)
+        states = np.asarray(states, dtype=np.int64)
+        u = np.asarray(u, dtype=np.float64)
+        newstates = np.empty(len(states), dtype=np.int64)
+        for s in range(len(cdf)):
+            mask = states == s
+            newstates[mask] = np.searchsorted(cdf[s], u[mask], side='right')
+        return newstates
+
+    def _transition_cdfs(self, trans: dict) -> tuple:
+        entry = self._cdfs.get(trans)
+        if entry is None:
+            cdf = np.array([trans[s] for s in self.states], dtype=np.float64)
+            cdf = cdf.cumsum(axis=1)
+            cdf /= cdf[:, -1:]
+            entry = self._cdfs.put(trans, (cdf, cdf.tolist()))
+        return entry
+
+    def adjacency(self, geometry: Optional[dict] = None,
+                  radius: float = 1.5):
+        """The neighbouring keys of each key (see `KeyAdjacency`)
+
+        Parameters:
+        -----------
+        geometry : dict  (Default: None)
+            The physical key rows (see `macbook_us_geometry`). If None, the
+              geometry of a built-in keymap is used.
+
+        radius : float  (Default: 1.5)
+            The maximum distance between neighbours (in key widths)
+        """
+        if geometry is None:
+            geometry = default_geometry(self.keymap)
+        adj = self._adjacency.get(geometry, (radius,))
+        if adj is None:
+            positions = key_positions(geometry)
+            if len(positions) != len(self.table[0]):
+                raise ValueError("The geometry has {} keys but the keymap "
+                                 "{}".format(len(positions),
+                                             len(self.table[0])))
+            adj = self._adjacency.put(
+                geometry, KeyAdjacency(positions, radius), (radius,))
+        return adj
+
+
+class KeyAdjacency(object):
+    """Sparse matrix (CSR) of neighbouring keys and their probabilities
+
+    The probability to hit a neighbour is proportional to the inverse
+      squared distance between the key centers.
+
+    Parameters:
+    -----------
+    positions : np.ndarray
+        The (x, y) center of each key in key widths
+
+    radius : float  (Default: 1.5)
+        The maximum distance between neighbours
+
+    Attributes:
+    -----------
+    indptr, indices, probs : np.ndarray
+        The neighbours of key `i` are `indices[indptr[i]:indptr[i + 1]]`
+          with the probabilities `probs[indptr[i]:indptr[i + 1]]`
+
+    Examples:
+    ---------
+        adj = compile_keymap(qwertz_de).adjacency()
+        idx, state = compile_keymap(qwertz_de).index["g"]
+        adj.neighbours(idx)
+    """
+    def __init__(self, positions: np.ndarray, radius: float = 1.5):
+        positions = np.asarray(positions, dtype=np.float64)
+        n = len(positions)
+        diff = positions[:, None, :] - positions[None, :, :]
+        dist = np.sqrt((diff ** 2).sum(axis=-1))
+        mask = (dist > 0) & (dist <= radius)
+        rows, cols = np.nonzero(mask)
+        weights = 1.0 / dist[rows, cols] ** 2
+        total = np.bincount(rows, weights=weights, minlength=n)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(mask.sum(axis=1))
+        self.indices = cols.astype(np.int64)
+        self.probs = weights / total[rows]
+        # `row + cumulative probability within the row`, i.e. the entries
+        # of row `i` are in the interval (i, i + 1]
+        cum = np.cumsum(self.probs)
+        start = np.concatenate([[0.0], cum])[self.indptr[:-1]]
+        self._keys = rows + cum - start[rows]
+        self._keys[self.indptr[1:][self.indptr[1:] > self.indptr[:-1]] - 1] \
+            = np.unique(rows) + 1.0
+        # as lists for single draws
+        self._indptr_list = self.indptr.tolist()
+        self._indices_list = self.indices.tolist()
+        self._keys_list = self._keys.tolist()
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def neighbours(self, idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The neighbours of a key, and their probabilities"""
+        a, b = self.indptr[idx], self.indptr[idx + 1]
+        return self.indices[a:b], self.probs[a:b]
+
+    def sample_one(self, idx: int, u: float) -> int:
+        """Draw a neighbour of one key (-1 if it has none)"""
+        a, b = self._indptr_list[idx], self._indptr_list[idx + 1]
+        if a == b:
+            return -1
+        pos = bisect.bisect_right(self._keys_list, idx + u, a, b - 1)
+        return self._indices_list[pos]
+
+    def sample(self, idx: np.ndarray, u: np.ndarray) -> np.ndarray:
+        """Draw a neighbour of each key with one vectorized search
+
+        Parameters:
+        -----------
+        idx : np.ndarray
+            Key indices
+
+        u : np.ndarray
+            Uniform random numbers from [0, 1), one for each key
+
+        Return:
+        -------
+        np.ndarray
+            The indices of the neighbouring keys (-1 if a key has none)
+        """
+        idx = np.asarray(idx, dtype=np.int64)
+        pos = np.searchsorted(self._keys, idx + np.asarray(u), side='right')
+        last = self.indptr[idx + 1] - 1
+        pos = np.minimum(pos, last)
+        return np.where(last >= self.indptr[idx],
+                        self.indices[np.maximum(pos, 0)], -1)
+
+
+# the recently compiled keymaps
+_compiled = _IdentityCache(maxsize=32)
+
+
+def compile_keymap(keymap: Union[dict, CompiledKeymap]) -> CompiledKeymap:
+    """Compile a keymap once, and return the cached object afterwards
+
+    The keymap dict must not be modified after it was compiled. The 32
+      most recently used keymaps are cached.
+
+    Examples:
+        km = compile_keymap(qwertz_de)
+        km is compile_keymap(qwertz_de)
+        # True
+    """
+    if isinstance(keymap, CompiledKeymap):
+        return keymap
+    km = _compiled.get(keymap)
+    if km is None:
+        km = _compiled.put(keymap, CompiledKeymap(keymap))
+    return km
+
+
+def find_index(c: str, keymap: Union[dict, CompiledKeymap]) -> (int, str):
     """Find index
     Examples:
         idx, mode = find_index("h", macbook_us)
     """
-    for mode in keymap.keys():
-        try:
-            return keymap[mode].index(c), mode
-        except Exception:
-            pass
-    return None, None
+    return compile_keymap(keymap).find(c)
+
+
+def key_positions(geometry: dict) -> np.ndarray:
+    """The (x, y) center of each key in key widths
+
+    Example:
+    --------
+        key_positions(macbook_us_geometry)[:2]
+        # array([[0., 0.], [1., 0.]])
+    """
+    return np.array([(offset + k, row)
+                     for row, (num, offset) in enumerate(
+                         zip(geometry["rows"], geometry["offsets"]))
+                     for k in range(num)], dtype=np.float64)
+
+
+def default_geometry(keymap: Union[dict, CompiledKeymap]) -> dict:
+    """The key geometry of a built-in keymap"""
+    if isinstance(keymap, CompiledKeymap):
+        keymap = keymap.keymap
+    if keymap is macbook_us:
+        return macbook_us_geometry
+    if keymap is qwertz_de:
+        return qwertz_de_geometry
+    raise ValueError("No default key geometry for this keymap")
 
 
 # default transition probabilities
@@ -75,3 +381,16 @@ qwertz_de = {
         '', '›', '‹', '©', '‚', '‘', '’', 'º', '×', '÷', '—'
     ]
 }
+
+
+# physical key rows: the number of keys per row (in the order of the keymap),
+# and the horizontal offset of each row in key widths
+macbook_us_geometry = {
+    "rows": [13, 13, 11, 10],
+    "offsets": [0.0, 1.5, 1.75, 2.25]
+}
+
+qwertz_de_geometry = {
+    "rows": [13, 12, 12, 11],
+    "offsets": [0.0, 1.5, 1.75, 1.25]
+}
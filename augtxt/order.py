@@ -1,110 +1,172 @@
 import numpy as np
-from typing import List
+from typing import Dict, List, Optional, Union
+from augtxt.rng import get_rng
+from augtxt.tokenizer import (
+    tokenize, TokenizedSentence, PretokenizedSentence)
+import functools
 import re
 
 
-def swap_consecutive(original,
+_MULTISPACE = re.compile(' +')
+
+
+@functools.lru_cache(maxsize=None)
+def _punct_pattern(punct: str):
+    """Whitespace followed by a punctuation char"""
+    return re.compile(f"\\s(?=[{re.escape(punct)}])")
+
+
+def _cleanup(text: str, punct: str) -> str:
+    """Remove needless whitespace"""
+    text = text.strip()
+    text = _MULTISPACE.sub(' ', text)
+    return _punct_pattern(punct).sub("", text)
+
+
+class OrderAugmenter(object):
+    """Word order errors for a given punctuation set and excluded tokens
+
+    The regex patterns are compiled once per punctuation set, i.e. the
+      methods do not compile any regex per sentence. The module functions
+      `augtxt.order.*` create such an instance on each call.
+
+    Parameters:
+    -----------
+    exclude : List[str]
+        List of strings that are excluded from augmentation
+
+    punct : str
+        The punctuation chars that separate tokens (besides whitespace)
+
+    Example:
+    --------
+        from augtxt.order import OrderAugmenter
+        augmenter = OrderAugmenter(exclude=["[MASK]"], punct=".,;:!?")
+        augm = [augmenter.drop_word(s) for s in sentences]
+    """
+    def __init__(self, exclude: List[str] = ["[MASK]"],
+                 punct: str = ".,;:!?"):
+        self.exclude = [] if exclude is None else list(exclude)
+        self.punct = punct
+        self._punct_pattern = _punct_pattern(punct)
+
+    def _tokenize(self, original):
+        """Tokenize, and find the indices of the tokens not excluded"""
+        sent = tokenize(original, self.punct)
+        indicies = np.where([t not in self.exclude for t in sent.tokens])[0]
+        return sent, sent.tokens, indicies
+
+    def _pairs(self, indicies: np.ndarray) -> np.ndarray:
+        """The eligible pairs of consecutive tokens"""
+        twoidx = np.c_[indicies[:-1], indicies[1:]]
+        return twoidx[(twoidx[:, 1] - twoidx[:, 0]) == 1]
+
+    def _rebuild(self, sent: Union[TokenizedSentence, PretokenizedSentence],
+                 new: Union[Dict[int, Union[str, List[str]]], List[str]]
+                 ) -> Union[str, List[str]]:
+        """Replace words, i.e. a list replaces one word with several (or
+            no) tokens, and return the same form as the input"""
+        if isinstance(sent, PretokenizedSentence):
+            return sent.rebuild(new)
+        if isinstance(new, dict):
+            new = {i: v if isinstance(v, str) else " ".join(v)
+                   for i, v in new.items()}
+        # rebuild the sentence, and clean up needless whitespace
+        text = _MULTISPACE.sub(' ', sent.rebuild(new).strip())
+        if sent.punct != self.punct:
+            return _cleanup(text, sent.punct)
+        return self._punct_pattern.sub("", text)
+
+    def swap_consecutive(self,
+                         original: Union[str, List[str], TokenizedSentence],
+                         num_aug: int = 1,
+                         rng: Optional[np.random.Generator] = None):
+        """Swap two consecutive words"""
+        sent, token, indicies = self._tokenize(original)
+        # eligible combinations
+        twoidx = self._pairs(indicies)
+        # draw a random pair
+        selected = get_rng(rng).choice(
+            twoidx.shape[0], min(twoidx.shape[0], num_aug), replace=False)
+        # swap tokens
+        new = list(token)
+        for i, j in twoidx[selected, :]:
+            new[j], new[i] = new[i], new[j]
+        return self._rebuild(sent, new)
+
+    def drop_word(self,
+                  original: Union[str, List[str], TokenizedSentence],
+                  num_aug: int = 1,
+                  rng: Optional[np.random.Generator] = None):
+        """Drop a word"""
+        sent, token, indicies = self._tokenize(original)
+        # draw random tokens
+        selected = get_rng(rng).choice(
+            indicies, size=min(len(indicies), num_aug), replace=False)
+        # reomve words from string
+        new = {i: [] for i in selected}
+        return self._rebuild(sent, new)
+
+    def write_twice(self,
+                    original: Union[str, List[str], TokenizedSentence],
+                    num_aug: int = 1,
+                    rng: Optional[np.random.Generator] = None):
+        """Write a word twice"""
+        sent, token, indicies = self._tokenize(original)
+        # draw random tokens
+        selected = get_rng(rng).choice(
+            indicies, size=min(len(indicies), num_aug), replace=False)
+        # write words twice
+        new = {i: [token[i], token[i]] for i in selected}
+        return self._rebuild(sent, new)
+
+    def drop_n_next_twice(self,
+                          original: Union[str, List[str], TokenizedSentence],
+                          num_aug: int = 1,
+                          rng: Optional[np.random.Generator] = None):
+        """Drop a word, and write the next word twice"""
+        sent, token, indicies = self._tokenize(original)
+        # eligible combinations
+        twoidx = self._pairs(indicies)
+        # draw a random pair
+        selected = get_rng(rng).choice(
+            twoidx.shape[0], min(twoidx.shape[0], num_aug), replace=False)
+        # drop first token, and add the other one
+        new = {i: token[j] for i, j in twoidx[selected, :]}
+        return self._rebuild(sent, new)
+
+
+def swap_consecutive(original: Union[str, List[str], TokenizedSentence],
                      exclude: List[str] = ["[MASK]"],
                      punct: str = ".,;:!?",
-                     num_aug: int = 1):
-    # simple whitespace tokenization
-    token = [t for t in re.split(f"[ {punct}]", original) if len(t) > 0]
-    # which tokens are not excluded?
-    if exclude is None:
-        exclude = []
-    indicies = np.where([t not in exclude for t in token])[0]
-    # eligible combinations
-    twoidx = np.c_[indicies[:-1], indicies[1:]]
-    twoidx = twoidx[(twoidx[:, 1] - twoidx[:, 0]) == 1]
-    # draw a random pair
-    selected = np.random.choice(
-        twoidx.shape[0], min(twoidx.shape[0], num_aug), replace=False)
-    # swap tokens
-    for i, j in twoidx[selected, :]:
-        idx1 = original.find(token[i])
-        idx2 = original.find(token[j]) + len(token[j])
-        original = f"{original[:idx1]} {token[j]} {token[i]} {original[idx2:]}"
-        token[j], token[i] = token[i], token[j]
-    # clean up
-    original = original.strip()
-    original = re.sub(' +', ' ', original)
-    original = re.sub(f"\\s(?=[{punct}])", "", original)
-    # done
-    return original
-
-
-def drop_word(original,
+                     num_aug: int = 1,
+                     rng: Optional[np.random.Generator] = None):
+    return OrderAugmenter(exclude, punct).swap_consecutive(
+        original, num_aug=num_aug, rng=rng)
+
+
+def drop_word(original: Union[str, List[str], TokenizedSentence],
               exclude: List[str] = ["[MASK]"],
               punct: str = ".,;:!?",
-              num_aug: int = 1):
-    # simple whitespace tokenization
-    token = [t for t in re.split(f"[ {punct}]", original) if len(t) > 0]
-    # which tokens are not excluded?
-    if exclude is None:
-        exclude = []
-    indicies = np.where([t not in exclude for t in token])[0]
-    # draw random tokens
-    selected = np.random.choice(
-        indicies, size=min(len(indicies), num_aug), replace=False)
-    # reomve words from string
-    for i in selected:
-        original = original.replace(token[i], "").strip()
-    # clean up
-    original = re.sub(' +', ' ', original)
-    original = re.sub(f"\\s(?=[{punct}])", "", original)
-    # done
-    return original
-
-
-def write_twice(original,
+              num_aug: int = 1,
+              rng: Optional[np.random.Generator] = None):
+    return OrderAugmenter(exclude, punct).drop_word(
+        original, num_aug=num_aug, rng=rng)
+
+
+def write_twice(original: Union[str, List[str], TokenizedSentence],
                 exclude: List[str] = ["[MASK]"],
                 punct: str = ".,;:!?",
-                num_aug: int = 1):
-    # simple whitespace tokenization
-    token = [t for t in re.split(f"[ {punct}]", original) if len(t) > 0]
-    # which tokens are not excluded?
-    if exclude is None:
-        exclude = []
-    indicies = np.where([t not in exclude for t in token])[0]
-    # draw random tokens
-    selected = np.random.choice(
-        indicies, size=min(len(indicies), num_aug), replace=False)
-    # reomve words from string
-    for i in selected:
-        idx = original.find(token[i])
-        original = f"{original[:idx]}{token[i]} {original[idx:]}"
-    # clean up
-    original = original.strip()
-    original = re.sub(' +', ' ', original)
-    original = re.sub(f"\\s(?=[{punct}])", "", original)
-    # done
-    return original
-
-
-def drop_n_next_twice(original,
+                num_aug: int = 1,
+                rng: Optional[np.random.Generator] = None):
+    return OrderAugmenter(exclude, punct).write_twice(
+        original, num_aug=num_aug, rng=rng)
+
+
+def drop_n_next_twice(original: Union[str, List[str], TokenizedSentence],
                       exclude: List[str] = ["[MASK]"],
                       punct: str = ".,;:!?",
-                      num_aug: int = 1):
-    # simple whitespace tokenization
-    token = [t for t in re.split(f"[ {punct}]", original) if len(t) > 0]
-    # which tokens are not excluded?
-    if exclude is None:
-        exclude = []
-    indicies = np.where([t not in exclude for t in token])[0]
-    # eligible combinations
-    twoidx = np.c_[indicies[:-1], indicies[1:]]
-    twoidx = twoidx[(twoidx[:, 1] - twoidx[:, 0]) == 1]
-    # draw a random pair
-    selected = np.random.choice(
-        twoidx.shape[0], min(twoidx.shape[0], num_aug), replace=False)
-    # drop first token, and add the other one
-    for i, j in twoidx[selected, :]:
-        idx1 = original.find(token[i])
-        idx2 = original.find(token[j])
-        original = f"{original[:idx1]} {token[j]} {original[idx2:]}"
-    # clean up
-    original = original.strip()
-    original = re.sub(' +', ' ', original)
-    original = re.sub(f"\\s(?=[{punct}])", "", original)
-    # done
-    return original
+                      num_aug: int = 1,
+                      rng: Optional[np.random.Generator] = None):
+    return OrderAugmenter(exclude, punct).drop_n_next_twice(
+        original, num_aug=num_aug, rng=rng)
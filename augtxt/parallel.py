@@ -0,0 +1,390 @@
+from typing import (
+    AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional, Tuple,
+    Union)
+import collections
+import itertools
+import os
+import numpy as np
+import augtxt.augmenters
+import augtxt.tokenizer
+from augtxt.rng import shard_rng
+
+
+# the settings of the current worker process (see `_init_worker`)
+_worker_config = None
+
+
+def _init_worker(settings: dict, exclude: List[str]):
+    """Receive the settings once per worker process"""
+    global _worker_config
+    _worker_config = (settings, exclude)
+
+
+def _augment_shard(index: int,
+                   sentences: List[str],
+                   seed: np.random.SeedSequence,
+                   config: Optional[tuple] = None) -> List[List[str]]:
+    """Augment all sentences of one shard with the shard's random stream"""
+    settings, exclude = _worker_config if config is None else config
+    rng = shard_rng(seed, index)
+    return [augtxt.augmenters.sentaugm(s, settings, exclude, rng=rng)
+            for s in sentences]
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of `size` elements"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def sentaugm_corpus(sentences: Iterable[str],
+                    settings: dict,
+                    exclude: List[str] = ["[MASK]"],
+                    workers: Optional[int] = None,
+                    chunksize: int = 1000,
+                    seed: Optional[int] = None
+                    ) -> Iterator[List[str]]:
+    """Apply `sentaugm` to a corpus with a process pool
+
+    Parameters:
+    -----------
+    sentences : Iterable[str]
+        The sentences of the corpus. The iterable is consumed lazily.
+
+    settings : dict
+        see augtxt.augmenters.sentaugm. The settings are compiled once,
+          and shipped once to each worker process.
+
+    exclude : List[str]
+        List of strings that are excluded from augmentation
+
+    workers : int  (Default: None, i.e. the number of CPUs)
+        The number of worker processes. If 1, the corpus is augmented in
+          the current process.
+
+    chunksize : int  (Default: 1000)
+        The number of sentences per shard. Each shard has its own random
+          stream.
+
+    seed : int  (Default: None)
+        The root seed of the shards' random streams. For a given `seed`
+          and `chunksize`, the results are the same for any number of
+          workers.
+
+    Return:
+    -------
+    Iterator[List[str]]
+        The augmentations of each sentence in input order
+
+    Example:
+    --------
+        from augtxt.parallel import sentaugm_corpus
+        sentences = ['Die Lehrerin [MASK] einen Roman.'] * 10000
+        for augs in sentaugm_corpus(sentences, settings, seed=42):
+            pass
+    """
+    settings = augtxt.augmenters.compile_sentaugm_settings(settings)
+    seed = np.random.SeedSequence(seed)
+    shards = enumerate(_chunks(sentences, chunksize))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for index, chunk in shards:
+            yield from _augment_shard(
+                index, chunk, seed, config=(settings, exclude))
+        return
+
+    # keep a bounded number of shards in flight, and yield in input order
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(settings, exclude)) as executor:
+        pending = collections.deque()
+        for index, chunk in shards:
+            pending.append(executor.submit(
+                _augment_shard, index, chunk, seed))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _senttypo_chunk(index: int,
+                    sentences: list,
+                    plan: augtxt.augmenters.AugmentationPlan,
+                    exclude: List[str],
+                    num_augmentations: int,
+                    pmax: float,
+                    seed: np.random.SeedSequence) -> list:
+    """Apply `senttypo` to all sentences of one chunk with the chunk's own
+        random stream
+
+    The selected tokens and typo functions of the whole chunk are drawn
+      with two bulk NumPy calls (which release the GIL), and only the typo
+      functions run per word.
+    """
+    rng = shard_rng(seed, index)
+    sents, eligible, counts = [], [], []
+    for original in sentences:
+        sent = augtxt.tokenizer.tokenize(original)
+        indicies = [i for i, t in enumerate(sent.tokens) if t not in exclude]
+        num_aug = max(int(len(sent.tokens) * pmax), 1) if indicies else 0
+        sents.append(sent)
+        eligible.append(indicies)
+        counts.append(num_aug * num_augmentations)
+
+    # draw all tokens and functions at once
+    total = sum(counts)
+    tokpos = rng.random(total)
+    fns = plan.draw_fns(total, rng=rng).tolist()
+
+    results, offset = [], 0
+    for sent, indicies, count in zip(sents, eligible, counts):
+        if count == 0:
+            results.append([])
+            continue
+        num_aug = count // num_augmentations
+        selected = tokpos[offset:(offset + count)] * len(indicies)
+        selected = selected.astype(np.int64).tolist()
+        augmentations = []
+        for a in range(num_augmentations):
+            augwords = {}
+            for k in range(a * num_aug, (a + 1) * num_aug):
+                i = indicies[selected[k]]
+                j = fns[offset + k]
+                cfg = plan.draw_args(j, rng=rng)
+                word = augwords.get(i, sent.tokens[i])
+                augwords[i] = plan.fns[j](word, rng=rng, **cfg)
+            augmentations.append(sent.rebuild(augwords))
+        results.append(augmentations)
+        offset += count
+    return results
+
+
+def senttypo_many(sentences: Iterable[Union[str, List[str]]],
+                  settings: Union[List[dict],
+                                  augtxt.augmenters.AugmentationPlan],
+                  exclude: List[str] = None,
+                  num_augmentations: int = 1,
+                  pmax: float = 0.1,
+                  workers: Optional[int] = None,
+                  chunksize: int = 256,
+                  seed: Optional[int] = None
+                  ) -> List[Union[List[str], List[List[str]]]]:
+    """Apply `senttypo` to many sentences with a thread pool
+
+    Each chunk of sentences has its own random stream, i.e. the threads do
+      not share (and lock) the global `np.random` state, and the results
+      do not depend on the thread scheduling. The tokens and typo
+      functions of a chunk are drawn in bulk. The threads run in parallel
+      only while NumPy releases the GIL, e.g. for long chunks, and many
+      augmentations per sentence. For Python-heavy settings, use a
+      process pool (see `sentaugm_corpus`).
+
+    Parameters:
+    -----------
+    sentences : Iterable[Union[str, List[str]]]
+        The sentences as strings or pretokenized token lists
+
+    settings : Union[List[dict], AugmentationPlan]
+        see augtxt.augmenters.senttypo. The settings are compiled once,
+          and shared by all threads.
+
+    exclude, num_augmentations, pmax
+        see augtxt.augmenters.senttypo
+
+    workers : int  (Default: None, i.e. the number of CPUs)
+        The number of threads. If 1, the sentences are augmented in the
+          current thread.
+
+    chunksize : int  (Default: 256)
+        The number of sentences per chunk
+
+    seed : int  (Default: None)
+        The root seed of the chunks' random streams. For a given `seed`
+          and `chunksize`, the results are the same for any number of
+          workers.
+
+    Return:
+    -------
+    List[Union[List[str], List[List[str]]]]
+        The augmentations of each sentence in input order
+
+    Example:
+    --------
+        from augtxt.augmenters import AugmentationPlan
+        from augtxt.parallel import senttypo_many
+        plan = AugmentationPlan(settings)
+        augs = senttypo_many(sentences, plan, workers=4, seed=42)
+    """
+    plan = augtxt.augmenters._as_plan(settings, "cdf")
+    exclude = [] if exclude is None else list(exclude)
+    seed = np.random.SeedSequence(seed)
+    chunks = list(_chunks(sentences, chunksize))
+    args = (plan, exclude, num_augmentations, pmax, seed)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(chunks) <= 1:
+        results = [_senttypo_chunk(index, chunk, *args)
+                   for index, chunk in enumerate(chunks)]
+    else:
+        import concurrent.futures
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers) as executor:
+            futures = [executor.submit(_senttypo_chunk, index, chunk, *args)
+                       for index, chunk in enumerate(chunks)]
+            results = [f.result() for f in futures]
+    return [augs for chunk in results for augs in chunk]
+
+
+async def _aiter(sentences):
+    """Wrap a (synchronous) iterable as async iterable"""
+    for sentence in sentences:
+        yield sentence
+
+
+async def _achunk(iterator, size: int) -> list:
+    """The next `size` items of an async iterator (empty at the end)"""
+    chunk = []
+    try:
+        while len(chunk) < size:
+            chunk.append(await iterator.__anext__())
+    except StopAsyncIteration:
+        pass
+    return chunk
+
+
+async def sentaugm_async(sentences: Union[AsyncIterable[str],
+                                          Iterable[str]],
+                         settings: dict,
+                         exclude: List[str] = ["[MASK]"],
+                         workers: Optional[int] = None,
+                         executor=None,
+                         chunksize: int = 64,
+                         max_in_flight: Optional[int] = None,
+                         seed: Optional[int] = None
+                         ) -> AsyncIterator[Tuple[str, List[str]]]:
+    """Apply `sentaugm` to an async stream of sentences in an executor
+
+    The event loop is not blocked, i.e. e.g. an asyncio data loader can
+      prefetch while the sentences are augmented. The sentences are read
+      and submitted in chunks, and at most `max_in_flight` chunks are
+      submitted but not yielded yet. The next chunk is only read from
+      `sentences` if a slot is free, i.e. the memory usage does not depend
+      on the size of the stream (backpressure).
+
+    Parameters:
+    -----------
+    sentences : Union[AsyncIterable[str], Iterable[str]]
+        The sentences, e.g. an async generator. The iterable is consumed
+          lazily.
+
+    settings : dict
+        see augtxt.augmenters.sentaugm. The settings are compiled once,
+          and shipped once to each worker process.
+
+    exclude : List[str]
+        List of strings that are excluded from augmentation
+
+    workers : int  (Default: None, i.e. the number of CPUs)
+        The number of worker processes of the internal process pool. If 1,
+          the default executor of the event loop (a thread pool) is used.
+
+    executor : concurrent.futures.Executor  (Default: None)
+        An existing executor instead of the internal one. The settings
+          are then sent once per chunk.
+
+    chunksize : int  (Default: 64)
+        The number of sentences per chunk. Each chunk has its own random
+          stream. A chunk is yielded when all its sentences are done, i.e.
+          use small chunks for slow streams.
+
+    max_in_flight : int  (Default: None, i.e. `2 * workers`)
+        The maximum number of chunks submitted but not yielded yet
+
+    seed : int  (Default: None)
+        The root seed of the chunks' random streams. For a given `seed`
+          and `chunksize`, the augmentations do not depend on the executor
+          or completion order.
+
+    Return:
+    -------
+    AsyncIterator[Tuple[str, List[str]]]
+        The original sentence and its augmentations as soon as its chunk
+          is done, i.e. not necessarily in input order
+
+    Example:
+    --------
+        from augtxt.parallel import sentaugm_async
+
+        async def main(reader):
+            async for original, augs in sentaugm_async(
+                    reader, settings, workers=4, seed=42):
+                ...
+    """
+    import asyncio
+    settings = augtxt.augmenters.compile_sentaugm_settings(settings)
+    seed = np.random.SeedSequence(seed)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = 2 * max(1, workers)
+    if max_in_flight < 1 or chunksize < 1:
+        raise ValueError("max_in_flight and chunksize must be at least 1")
+    if not hasattr(sentences, "__aiter__"):
+        sentences = _aiter(sentences)
+    iterator = sentences.__aiter__()
+    loop = asyncio.get_running_loop()
+
+    # the settings are sent once per worker process, or once per chunk
+    owned, config = None, (settings, exclude)
+    if executor is None and workers > 1:
+        import concurrent.futures
+        owned = executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=config)
+        config = None
+
+    pending, reading, index = {}, None, 0
+    try:
+        while True:
+            # read the next chunk if there is a free slot
+            if reading is None and iterator is not None \
+                    and len(pending) < max_in_flight:
+                reading = asyncio.ensure_future(
+                    _achunk(iterator, chunksize))
+            waiting = set(pending) | ({reading} if reading else set())
+            if not waiting:
+                return
+            done, _ = await asyncio.wait(
+                waiting, return_when=asyncio.FIRST_COMPLETED)
+            # submit the new chunk
+            if reading in done:
+                chunk = reading.result()
+                reading = None
+                if len(chunk) < chunksize:
+                    iterator = None
+                if chunk:
+                    future = loop.run_in_executor(
+                        executor, _augment_shard, index, chunk, seed, config)
+                    pending[future] = chunk
+                    index += 1
+            # yield the sentences of the finished chunks
+            for future in done:
+                if future in pending:
+                    chunk = pending.pop(future)
+                    for item in zip(chunk, future.result()):
+                        yield item
+    finally:
+        if reading is not None:
+            reading.cancel()
+        for future in pending:
+            future.cancel()
+        if owned is not None:
+            await loop.run_in_executor(None, owned.shutdown)
@@ -1,11 +1,21 @@
+from typing import List, Optional, Set, Union
 import re
-import copy
+import warnings
 import numpy as np
+from augtxt.rng import get_rng
+from augtxt.tokenizer import TokenizedSentence
 
 
-def remove_syntaxinfo(text: str) -> str:
+_SYNTAXINFO = re.compile(r'[.?!;:,]+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def remove_syntaxinfo(text: Union[str, TokenizedSentence]) -> str:
     """ Remove `.?!;:,` from string (The $. and $, POS tags in STTS)
 
+    If `text` was tokenized with the same punctuation chars (see
+      `augtxt.tokenizer.tokenize`), its tokens are simply joined.
+
     Example:
     --------
     import augtxt.punct
@@ -13,30 +23,69 @@ def remove_syntaxinfo(text: str) -> str:
             "Die Schülerin [MASK] ein Aufsatz, der sehr [MASK] war.")
     augmented = augtxt.punct.remove_punctcomma(text)
     """
-    return re.sub(r'\s+', ' ', re.sub(r'[.?!;:,]+', ' ', text)).strip()
+    if isinstance(text, TokenizedSentence):
+        if set(text.punct) == set(".?!;:,"):
+            return " ".join(text.tokens)
+        text = text.text
+    return _WHITESPACE.sub(' ', _SYNTAXINFO.sub(' ', text)).strip()
+
+
+def _excluded(text: str, exclude: List[str]) -> Set[int]:
+    """The positions right before and after each occurrence of an
+        excluded string"""
+    positions = set()
+    for ex in exclude:
+        if not ex:
+            return set(range(len(text)))
+        start = text.find(ex)
+        while start >= 0:
+            positions.add(start - 1)
+            positions.add(start + len(ex))
+            start = text.find(ex, start + 1)
+    return positions
 
 
 def merge_words(text_: str,
                 sep=[" ", "-", "–"],
                 exclude=["[MASK]"],
-                num_aug: int = 1) -> str:
+                num_aug: int = 1,
+                rng: Optional[np.random.Generator] = None) -> str:
     """ Remove whitespace- or hyphen-seperated words
 
+    The separator chars next to an excluded string (e.g. "[MASK]") are not
+      removed. The char after a removed separator is lowercased. The new
+      string is built in one pass, i.e. the runtime is linear in the text
+      length and `num_aug`. A separator at the end of the text cannot be
+      merged, and raises a warning.
+
     Example:
     --------
     text = "Die Bindestrich-Wörter sind da."
     augmented = merge_words(text)
     """
-    text = copy.copy(text_)
-    indicies = [i for i, c in enumerate(text) if c in sep]
-    for ex in exclude:
-        indicies = [i for i in indicies if text[i + 1:i + len(ex) + 1] != ex]
-        indicies = [i for i in indicies if text[i - len(ex): i] != ex]
+    text = text_
+    excluded = _excluded(text, exclude)
+    indicies = [i for i, c in enumerate(text)
+                if c in sep and i not in excluded]
     if len(indicies) > 1:
-        indicies = np.flip(np.sort(np.random.choice(indicies, size=num_aug)))
+        indicies = get_rng(rng).choice(indicies, size=num_aug)
+        # a separator drawn twice is removed once
+        indicies = np.unique(indicies).tolist()
+    if len(indicies) == 0:
+        return text
+
+    if indicies[-1] == len(text) - 1:
+        warnings.warn("sep char at the end of text.")
+        indicies = indicies[:-1]
+
+    # remove the separators, and lowercase the next char
+    merged = set(indicies)
+    pieces, prev = [], 0
     for i in indicies:
-        try:
-            text = text[:i] + text[i + 1].lower() + text[(i + 2):]
-        except Exception:
-            print("sep char at the end of text.")
-    return text
+        pieces.append(text[prev:i])
+        prev = i + 1
+        if i + 1 not in merged:
+            pieces.append(text[i + 1].lower())
+            prev = i + 2
+    pieces.append(text[prev:])
+    return "".join(pieces)
@@ -0,0 +1,89 @@
+from typing import List, Optional, Union
+import numpy as np
+
+
+class GlobalRandomState(object):
+    """The global `np.random` state with the `np.random.Generator` API
+
+    The calls are forwarded to `np.random` at call time, i.e. seeding with
+      `np.random.seed` still works, and the random streams are the same as
+      before `rng` arguments were introduced.
+    """
+    def integers(self, low, high=None, size=None):
+        return np.random.randint(low, high, size)
+
+    def random(self, size=None):
+        return np.random.random_sample(size)
+
+    def binomial(self, n, p, size=None):
+        return np.random.binomial(n, p, size)
+
+    def choice(self, a, size=None, replace=True, p=None):
+        return np.random.choice(a, size, replace, p)
+
+    def permutation(self, x):
+        return np.random.permutation(x)
+
+
+global_state = GlobalRandomState()
+
+
+def get_rng(rng: Optional[np.random.Generator] = None):
+    """Return `rng`, or the global `np.random` state if `rng` is None
+
+    Examples:
+    ---------
+        from augtxt.rng import get_rng
+        get_rng(None).integers(0, 10)  # draws from np.random
+        get_rng(np.random.default_rng(42)).integers(0, 10)
+    """
+    return global_state if rng is None else rng
+
+
+def spawn(seed: Optional[Union[int, np.random.SeedSequence]],
+          num: int) -> List[np.random.Generator]:
+    """Create independent random streams, e.g. for parallel shards
+
+    Parameters:
+    -----------
+    seed : Union[int, np.random.SeedSequence]
+        The root seed. If None, fresh entropy is pulled from the OS.
+
+    num : int
+        The number of child streams
+
+    Return:
+    -------
+    List[np.random.Generator]
+        Statistically independent generators, i.e. the same `seed` always
+          gives the same streams.
+
+    Examples:
+    ---------
+        from augtxt.rng import spawn
+        rngs = spawn(42, 4)
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(s) for s in seed.spawn(num)]
+
+
+def shard_rng(seed: Optional[Union[int, np.random.SeedSequence]],
+              index: int) -> np.random.Generator:
+    """Create the random stream of the `index`-th shard
+
+    It's the same stream as `spawn(seed, index + 1)[index]`, but without
+      creating the streams of the other shards. Thus, shards can be
+      processed in any order or by any worker.
+
+    Examples:
+    ---------
+        from augtxt.rng import shard_rng
+        rng = shard_rng(42, 3)
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    child = np.random.SeedSequence(
+        seed.entropy, spawn_key=tuple(seed.spawn_key) + (index,),
+        pool_size=seed.pool_size)
+    return np.random.default_rng(child)
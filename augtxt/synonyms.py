@@ -0,0 +1,153 @@
+from typing import Dict, List, Iterator
+import collections.abc
+import os
+import numpy as np
+
+
+def _prefix(b: bytes) -> np.uint64:
+    """The first 8 bytes as sortable integer"""
+    return np.uint64(int.from_bytes(b[:8].ljust(8, b"\0"), "big"))
+
+
+class SynonymIndex(collections.abc.Mapping):
+    """Compact read-only synonym dictionary that is memory-mapped from disk
+
+    The index is a drop-in for the `synonyms` dict of
+      `augtxt.wordsubs.synonym_replacement`. It's built once offline with
+      `SynonymIndex.build`, and opened with `SynonymIndex.load` in each
+      worker process. The OS shares the memory-mapped pages across all
+      processes.
+
+    Files:
+    ------
+    strings.npy, offsets.npy
+        Interned table of all unique strings as UTF-8 bytes, i.e. string
+          `i` is `strings[offsets[i]:offsets[i + 1]]`
+
+    keys.npy, prefixes.npy
+        The string ids of the keys sorted by their UTF-8 bytes, and the
+          first 8 bytes of each key to narrow down the binary search
+
+    syn_offsets.npy, syn_ids.npy
+        The synonyms of key `k` are the string ids
+          `syn_ids[syn_offsets[k]:syn_offsets[k + 1]]`
+
+    Example:
+    --------
+        from augtxt.synonyms import SynonymIndex
+        SynonymIndex.build({"satz": ["sätze", "einzelsatz"]}, "syn-idx")
+        synonyms = SynonymIndex.load("syn-idx")
+        synonyms["satz"]
+        # ['sätze', 'einzelsatz']
+    """
+    _files = ("strings", "offsets", "keys", "prefixes",
+              "syn_offsets", "syn_ids")
+
+    def __init__(self, path: str, mmap: bool = True):
+        self.path = path
+        self.mmap = mmap
+        mode = "r" if mmap else None
+        for name in self._files:
+            setattr(self, f"_{name}", np.load(
+                os.path.join(path, f"{name}.npy"), mmap_mode=mode))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """Open an index (memory-mapped by default)"""
+        return cls(path, mmap=mmap)
+
+    @classmethod
+    def build(cls, synonyms: Dict[str, List[str]], path: str,
+              mmap: bool = True):
+        """Build an index from a synonym dictionary, and save it to `path`
+
+        Parameters:
+        -----------
+        synonyms : Dict[str, List[str]]
+            Synonym dictionary
+
+        path : str
+            The output folder
+
+        Return:
+        -------
+        SynonymIndex
+            The index opened from `path`
+        """
+        # intern all strings
+        ids, table = {}, []
+
+        def intern(s: str) -> int:
+            if s not in ids:
+                ids[s] = len(table)
+                table.append(s.encode("utf-8"))
+            return ids[s]
+
+        keys = sorted(synonyms.keys(), key=lambda k: k.encode("utf-8"))
+        key_ids, syn_offsets, syn_ids = [], [0], []
+        for key in keys:
+            key_ids.append(intern(key))
+            syn_ids.extend([intern(s) for s in synonyms[key]])
+            syn_offsets.append(len(syn_ids))
+
+        offsets = np.zeros(len(table) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in table])
+        arrays = {
+            "strings": np.frombuffer(b"".join(table), dtype=np.uint8),
+            "offsets": offsets,
+            "keys": np.array(key_ids, dtype=np.int64),
+            "prefixes": np.array([_prefix(table[i]) for i in key_ids],
+                                 dtype=np.uint64),
+            "syn_offsets": np.array(syn_offsets, dtype=np.int64),
+            "syn_ids": np.array(syn_ids, dtype=np.int64),
+        }
+        os.makedirs(path, exist_ok=True)
+        for name in cls._files:
+            np.save(os.path.join(path, f"{name}.npy"), arrays[name])
+        return cls.load(path, mmap=mmap)
+
+    def __reduce__(self):
+        # reopen the files in other processes (memory-mapped if they were)
+        return (SynonymIndex.load, (self.path, self.mmap))
+
+    def _bytes(self, i: int) -> bytes:
+        return self._strings[self._offsets[i]:self._offsets[i + 1]].tobytes()
+
+    def _string(self, i: int) -> str:
+        return self._bytes(i).decode("utf-8")
+
+    def _find(self, key: str) -> int:
+        """The position of `key` in the sorted keys, or -1"""
+        if not isinstance(key, str):
+            return -1
+        b = key.encode("utf-8")
+        p = _prefix(b)
+        lo = int(np.searchsorted(self._prefixes, p, side="left"))
+        hi = int(np.searchsorted(self._prefixes, p, side="right"))
+        while lo < hi:
+            mid = (lo + hi) // 2
+            other = self._bytes(self._keys[mid])
+            if other < b:
+                lo = mid + 1
+            elif other > b:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def __contains__(self, key) -> bool:
+        return self._find(key) >= 0
+
+    def __getitem__(self, key: str) -> List[str]:
+        k = self._find(key)
+        if k < 0:
+            raise KeyError(key)
+        start, end = self._syn_offsets[k], self._syn_offsets[k + 1]
+        return [self._string(i) for i in self._syn_ids[start:end]]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in self._keys:
+            yield self._string(i)
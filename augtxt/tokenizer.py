@@ -0,0 +1,219 @@
+from typing import Dict, List, Tuple, Union
+import functools
+import re
+
+
+@functools.lru_cache(maxsize=None)
+def _token_pattern(punct: str):
+    """A token is a run of chars that are neither whitespace nor `punct`"""
+    return re.compile(f"[^\\s{re.escape(punct)}]+")
+
+
+# a sentence starts with a non-whitespace char, and ends with punctuation
+# (and closing quotes or brackets) before whitespace, before a blank line, or
+# at the end of the text
+_SENTENCE = re.compile(
+    r'\S.*?(?:[.!?]+["\'\)\]»«“”]*(?=\s|$)|(?=\n\s*\n)|$)', re.S)
+
+
+def segment(text: str) -> List[Tuple[int, int]]:
+    """Split a document into sentences
+
+    Parameters:
+    -----------
+    text : str
+        The document
+
+    Return:
+    -------
+    List[Tuple[int, int]]
+        The start and end offset of each sentence, i.e. the whitespace
+          between sentences is not part of any sentence.
+
+    Example:
+    --------
+        from augtxt.tokenizer import segment
+        segment("Die Frau steht da.  Wer ist das?\nEnde")
+        # [(0, 18), (20, 32), (33, 37)]
+    """
+    spans = []
+    for m in _SENTENCE.finditer(text):
+        start = m.start()
+        end = start + len(m.group().rstrip())
+        if end > start:
+            spans.append((start, end))
+    return spans
+
+
+class TokenizedSentence(object):
+    """A sentence, its tokens, and the character offsets of each token
+
+    Parameters:
+    -----------
+    text : str
+        The original sentence
+
+    tokens : List[str]
+        The tokens, i.e. `tokens[i] == text[spans[i][0]:spans[i][1]]`
+
+    spans : List[Tuple[int, int]]
+        The start and end offset of each token
+
+    punct : str
+        The punctuation chars that separate tokens (besides whitespace)
+
+    Example:
+    --------
+        from augtxt.tokenizer import tokenize
+        sent = tokenize("Die Frau, die da steht.")
+        sent.tokens
+        # ['Die', 'Frau', 'die', 'da', 'steht']
+        sent.rebuild({2: "dei"})
+        # 'Die Frau, dei da steht.'
+    """
+    def __init__(self, text: str,
+                 tokens: List[str],
+                 spans: List[Tuple[int, int]],
+                 punct: str = ".,;:!?"):
+        self.text = text
+        self.tokens = tokens
+        self.spans = spans
+        self.punct = punct
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def rebuild(self, replacements: Union[Dict[int, str], List[str]]) -> str:
+        """Replace tokens, and build the new sentence in one pass
+
+        Parameters:
+        -----------
+        replacements : Union[Dict[int, str], List[str]]
+            Either a dict with the new string of some token indices, or
+              a list with the new string of each token. The whitespace and
+              punctuation between tokens are kept.
+
+        Return:
+        -------
+        str
+            The new sentence
+        """
+        if isinstance(replacements, dict):
+            items = sorted(replacements.items())
+        else:
+            items = enumerate(replacements)
+        pieces, prev = [], 0
+        for i, new in items:
+            start, end = self.spans[i]
+            pieces.append(self.text[prev:start])
+            pieces.append(new)
+            prev = end
+        pieces.append(self.text[prev:])
+        return "".join(pieces)
+
+
+class PretokenizedSentence(object):
+    """A sentence that was already tokenized, e.g. by an upstream
+        whitespace or subword tokenizer
+
+    Tokens that consist of punctuation chars only are kept but are not
+      words, i.e. the same words as in a `TokenizedSentence` can be
+      augmented.
+
+    Parameters:
+    -----------
+    source : List[str]
+        All tokens of the sentence
+
+    punct : str
+        The punctuation chars
+
+    Example:
+    --------
+        from augtxt.tokenizer import tokenize
+        sent = tokenize(["Die", "Frau", ",", "die", "da", "steht", "."])
+        sent.tokens
+        # ['Die', 'Frau', 'die', 'da', 'steht']
+        sent.rebuild({2: "dei"})
+        # ['Die', 'Frau', ',', 'dei', 'da', 'steht', '.']
+    """
+    def __init__(self, source: List[str], punct: str = ".,;:!?"):
+        self.source = [str(t) for t in source]
+        self.punct = punct
+        # the positions of the words in `source`
+        self.positions = [k for k, t in enumerate(self.source)
+                          if any(c not in punct and not c.isspace()
+                                 for c in t)]
+        self.tokens = [self.source[k] for k in self.positions]
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def rebuild(self, replacements: Union[Dict[int, Union[str, List[str]]],
+                                          List[str]]) -> List[str]:
+        """Replace words, and return the new token list
+
+        Parameters:
+        -----------
+        replacements : Union[Dict[int, Union[str, List[str]]], List[str]]
+            Either a dict with the new token(s) of some word indices, or a
+              list with the new token of each word. A list of tokens
+              replaces one word with several (or no) tokens.
+
+        Return:
+        -------
+        List[str]
+            The new tokens
+        """
+        if not isinstance(replacements, dict):
+            replacements = dict(enumerate(replacements))
+        new = {self.positions[i]: v for i, v in replacements.items()}
+        result = []
+        for k, t in enumerate(self.source):
+            v = new.get(k, t)
+            if isinstance(v, str):
+                result.append(v)
+            else:
+                result.extend(v)
+        return result
+
+
+def tokenize(text: Union[str, List[str], TokenizedSentence,
+                         PretokenizedSentence],
+             punct: str = ".,;:!?"
+             ) -> Union[TokenizedSentence, PretokenizedSentence]:
+    """Split a sentence into tokens with character offsets
+
+    Parameters:
+    -----------
+    text : Union[str, List[str], TokenizedSentence, PretokenizedSentence]
+        The sentence. A list (or array) of tokens is not split again, but
+          wrapped as `PretokenizedSentence`. Tokens with offsets from an
+          upstream tokenizer can be passed as `TokenizedSentence`. A
+          `TokenizedSentence` or `PretokenizedSentence` is returned as it
+          is.
+
+    punct : str
+        The punctuation chars that separate tokens (besides whitespace)
+
+    Return:
+    -------
+    Union[TokenizedSentence, PretokenizedSentence]
+        The tokens and their offsets
+
+    Example:
+    --------
+        from augtxt.tokenizer import tokenize
+        sent = tokenize("Die Lehrerin [MASK] einen Roman.")
+        sent.spans
+        # [(0, 3), (4, 12), (13, 19), (20, 25), (26, 31)]
+    """
+    if isinstance(text, (TokenizedSentence, PretokenizedSentence)):
+        return text
+    if not isinstance(text, str):
+        return PretokenizedSentence(text, punct)
+    tokens, spans = [], []
+    for m in _token_pattern(punct).finditer(text):
+        tokens.append(m.group())
+        spans.append(m.span())
+    return TokenizedSentence(text, tokens, spans, punct)
@@ -1,10 +1,68 @@
-from typing import Optional, Union
+from typing import Optional, Union, List, Callable, Dict, Tuple
+import bisect
 import numpy as np
-import scipy.stats
 import augtxt.keyboard_layouts as kbl
+from augtxt.rng import get_rng
 
 
-def draw_index(n: int, loc: Union[int, float, str]) -> int:
+def _binom_p(loc: Union[float, str]) -> Optional[float]:
+    """Translate a random `loc` spec into the `p` of the binomial
+        distribution (`None` means uniform random)"""
+    if isinstance(loc, float):
+        return max(0.0, min(1.0, loc))
+    if loc in ('uniform', 'u'):
+        return None
+    elif loc in ('begin', 'b'):
+        return 0.1
+    elif loc in ('middle', 'm'):
+        return 0.5
+    elif loc in ('end', 'e'):
+        return 0.9
+    raise Exception("Unknown p (loc) for binom")
+
+
+class IndexBuffer(object):
+    """Pre-filled buffer of indices that are consumed in order
+
+    Parameters:
+    -----------
+    indices : array-like
+        Pre-drawn indices, e.g. from `augtxt.typo.draw_indices`
+
+    Examples:
+    ---------
+        import numpy as np
+        from augtxt.typo import IndexBuffer, swap_consecutive
+        words = ["Kinder", "Eltern", "Tante"]
+        n = np.array([len(w) for w in words]) - 2
+        buf = IndexBuffer.fill(n, loc='u')
+        augm = [swap_consecutive(w, loc=buf) for w in words]
+    """
+    def __init__(self, indices):
+        self.indices = np.asarray(indices, dtype=np.int64).tolist()
+        self.pos = 0
+
+    @classmethod
+    def fill(cls, n, loc: Union[int, float, str],
+             rng: Optional[np.random.Generator] = None):
+        """Draw all indices with one `augtxt.typo.draw_indices` call"""
+        return cls(draw_indices(n, loc, rng=rng))
+
+    def __len__(self) -> int:
+        return len(self.indices) - self.pos
+
+    def pop(self, n: int) -> int:
+        """Return the next index, clipped to the interval [0,n]"""
+        if self.pos >= len(self.indices):
+            raise IndexError("IndexBuffer is exhausted")
+        i = self.indices[self.pos]
+        self.pos += 1
+        return max(0, min(n, i))
+
+
+def draw_index(n: int,
+               loc: Union[int, float, str, IndexBuffer],
+               rng: Optional[np.random.Generator] = None) -> int:
     """Get index
 
     Parameters:
@@ -12,13 +70,18 @@ def draw_index(n: int, loc: Union[int, float, str]) -> int:
     n : int
         upper value from interval [0,n] to draw from
 
-    loc : Union[int, float, str]
+    loc : Union[int, float, str, IndexBuffer]
         If `int`, the index of the 1st char to swap
         If `float`, the `p` of `binom.rvs(n, p)`
         If 'b', then `binom.rvs(n, p=0.1)`
         If 'm', then `binom.rvs(n, p=0.5)`
         If 'e', then `binom.rvs(n, p=0.9)`
         if 'u', then uniform random
+        If `IndexBuffer`, the next pre-drawn index
+
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
 
     Return:
     -------
@@ -30,33 +93,184 @@ def draw_index(n: int, loc: Union[int, float, str]) -> int:
         np.random.seed(seed=42)
         idx = draw_index(7, loc='middle')
     """
-    if isinstance(loc, int):  # Given index
-        i = max(0, min(n, loc))
+    if isinstance(loc, IndexBuffer):  # Pre-drawn index
+        return loc.pop(n)
+
+    if isinstance(loc, (int, np.integer)):  # Given index
+        return max(0, min(n, int(loc)))
+
+    # Pick random index
+    p = _binom_p(loc)
+    if p is None:
+        return get_rng(rng).integers(0, n + 1)
+    return get_rng(rng).binomial(n, p)
+
+
+def draw_indices(n: np.ndarray,
+                 loc: Union[int, float, str],
+                 rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Get indices for many words with one vectorized draw
+
+    Parameters:
+    -----------
+    n : np.ndarray
+        upper values from intervals [0,n[k]] to draw from, e.g. word lengths
+          minus 1 or 2
+
+    loc : Union[int, float, str]
+        see augtxt.typo.draw_index
+
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
+    Return:
+    -------
+    np.ndarray
+        The list indices. For a given seed, the indices are the same as
+          calling `augtxt.typo.draw_index` for each element of `n`.
+
+    Examples:
+    ---------
+        np.random.seed(seed=42)
+        idx = draw_indices(np.array([7, 3, 5]), loc='middle')
+    """
+    n = np.asarray(n, dtype=np.int64)
+    if isinstance(loc, (int, np.integer)):  # Given index
+        return np.maximum(0, np.minimum(n, int(loc)))
+
+    # Pick random indices
+    p = _binom_p(loc)
+    if p is None:
+        return get_rng(rng).integers(0, n + 1)
+    return get_rng(rng).binomial(n, p)
+
 
-    elif isinstance(loc, float):  # Pick random index
-        p = max(0.0, min(1.0, loc))
-        i = scipy.stats.binom.rvs(n, p)
+def index_pmf(n: int, loc: Union[int, float, str]) -> List[float]:
+    """The exact probabilities of `draw_index(n, loc)` for each index
+
+    Parameters:
+    -----------
+    n : int
+        upper value from interval [0,n]
+
+    loc : Union[int, float, str]
+        see augtxt.typo.draw_index
+
+    Return:
+    -------
+    List[float]
+        The probabilities of the indices 0, 1, ..., n
+
+    Examples:
+    ---------
+        index_pmf(2, loc='m')
+        # [0.25, 0.5, 0.25]
+    """
+    n = max(0, int(n))
+    if isinstance(loc, (int, np.integer)):  # Given index
+        pmf = [0.0] * (n + 1)
+        pmf[max(0, min(n, int(loc)))] = 1.0
+        return pmf
 
-    elif isinstance(loc, str):  # Pick random index
-        if loc in ('uniform', 'u'):
-            i = scipy.stats.randint.rvs(0, n + 1)
+    p = _binom_p(loc)
+    if p is None:
+        return [1.0 / (n + 1)] * (n + 1)
+    # binomial coefficients, i.e. binom.pmf(k, n, p)
+    pmf, coef = [], 1
+    for k in range(n + 1):
+        pmf.append(coef * p ** k * (1.0 - p) ** (n - k))
+        coef = coef * (n - k) // (k + 1)
+    return pmf
+
+
+# an edit is a (position, op, char) tuple, i.e. insert `char` before the char
+# at `position` ("ins"), replace it ("sub"), or delete it ("del")
+Edit = Tuple[int, str, str]
+
+
+def _sorted_edits(edits: List[Edit]) -> List[Edit]:
+    """Sort by position, and insert before a "sub" or "del" of the same
+        position"""
+    return sorted(edits, key=lambda e: (e[0], e[1] != "ins"))
+
+
+def apply_edits(word: Union[str, List[str]], edits: List[Edit]) -> str:
+    """Build the augmented word from an edit script in one pass
+
+    Parameters:
+    -----------
+    word : Union[str, List[str]]
+        One word token, or its chars
+
+    edits : List[Tuple[int, str, str]]
+        The `(position, op, char)` edits of the typo functions (e.g.
+          `augtxt.typo.drop_char_edits`). The positions refer to `word`.
+
+    Return:
+    -------
+    str
+        The augmented word
+
+    Example:
+    --------
+        from augtxt.typo import apply_edits
+        apply_edits("Kinder", [(0, "sub", "i"), (1, "sub", "K")])
+        # 'iKnder'
+    """
+    if len(edits) > 1:
+        edits = _sorted_edits(edits)
+    return _apply_sorted_edits(word, edits)
+
+
+def _apply_sorted_edits(word: Union[str, List[str]],
+                        edits: List[Edit]) -> str:
+    """Same as `apply_edits` for edits in the order of `_sorted_edits`"""
+    if not edits:
+        return word if isinstance(word, str) else "".join(word)
+    if len(edits) == 1 and isinstance(word, str):
+        pos, op, c = edits[0]
+        return word[:pos] + c + word[(pos + (op != "ins")):]
+    pieces, prev = [], 0
+    for pos, op, c in edits:
+        pieces.append(word[prev:pos])
+        if op == "ins":
+            pieces.append(c)
+            prev = pos
         else:
-            if loc in ('begin', 'b'):
-                p = 0.1
-            elif loc in ('middle', 'm'):
-                p = 0.5
-            elif loc in ('end', 'e'):
-                p = 0.9
-            else:
-                raise Exception("Unknown p (loc) for binom")
-            i = scipy.stats.binom.rvs(n, p)
+            if op == "sub":
+                pieces.append(c)
+            prev = pos + 1
+    pieces.append(word[prev:])
+    if isinstance(word, str):
+        return "".join(pieces)
+    return "".join(["".join(piece) for piece in pieces])
 
-    return i
+
+def apply_edits_inplace(chars: List[str], edits: List[Edit]) -> List[str]:
+    """Apply an edit script to a mutable char list
+
+    Several typo functions can be applied to the same list, and the word is
+      joined only once at the end (see `augtxt.augmenters.wordtypo`).
+    """
+    # from the back to the front, i.e. the positions of the remaining
+    # edits do not shift. A new char can be several chars long (e.g.
+    # 'ß'.upper() == 'SS'), and is spliced in char by char, i.e. the list
+    # keeps one element per char of the word.
+    for pos, op, c in reversed(_sorted_edits(edits)):
+        if op == "ins":
+            chars[pos:pos] = c
+        elif op == "sub":
+            chars[pos:(pos + 1)] = c
+        else:
+            del chars[pos]
+    return chars
 
 
 def swap_consecutive(word: str,
                      loc: Optional[Union[int, float, str]] = 'u',
-                     keep_case: Optional[bool] = False
+                     keep_case: Optional[bool] = False,
+                     rng: Optional[np.random.Generator] = None
                      ) -> str:
     """Swap two consecutive chars (dt. Vertauscher)
 
@@ -71,6 +285,10 @@ def swap_consecutive(word: str,
     keep_case : bool  (Default False, i.e. never)
         Enforce the original letter cases on the new string.
 
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
     Return:
     -------
     str
@@ -91,35 +309,40 @@ def swap_consecutive(word: str,
         swap_consecutive("Kinder", loc='end', keep_case=True)
         # 'Kindre', 'Iknder', 'Kindre'
     """
+    return apply_edits(
+        word, swap_consecutive_edits(word, loc, keep_case, rng=rng))
+
+
+def swap_consecutive_edits(word: Union[str, List[str]],
+                           loc: Optional[Union[int, float, str]] = 'u',
+                           keep_case: Optional[bool] = False,
+                           rng: Optional[np.random.Generator] = None
+                           ) -> List[Edit]:
+    """The edit script of `swap_consecutive` (see `apply_edits`)"""
     # abort prematurly
     n_chars = len(word)
     if n_chars < 2:
-        return word
-
-    # copy string to mutable char list
-    res = [c for c in word]
+        return []
 
     # find index of the 1st char
-    i = draw_index(n_chars - 2, loc)
+    i = draw_index(n_chars - 2, loc, rng=rng)
+    return _swap_consecutive_at(word, i, keep_case)
 
-    # enforce letter case
-    if keep_case:
-        c0, c1 = res[i].isupper(), res[i + 1].isupper()
-
-    # swap
-    res[i], res[i + 1] = res[i + 1], res[i]
 
-    # enforce previous letter cases
+def _swap_consecutive_at(word: Union[str, List[str]], i: int,
+                         keep_case: bool) -> List[Edit]:
+    # swap, and enforce previous letter cases
+    a, b = word[i + 1], word[i]
     if keep_case:
-        res[i] = res[i].upper() if c0 else res[i].lower()
-        res[i + 1] = res[i + 1].upper() if c1 else res[i + 1].lower()
-
-    return ''.join(res)
+        a = a.upper() if word[i].isupper() else a.lower()
+        b = b.upper() if word[i + 1].isupper() else b.lower()
+    return [(i, "sub", a), (i + 1, "sub", b)]
 
 
 def pressed_twice(word: str,
                   loc: Optional[Union[int, float, str]] = 'u',
-                  keep_case: Optional[bool] = False
+                  keep_case: Optional[bool] = False,
+                  rng: Optional[np.random.Generator] = None
                   ) -> str:
     """A key is pressed twice accidentaly (dt. Einfüger)
 
@@ -134,6 +357,10 @@ def pressed_twice(word: str,
     flip_case : bool  (Default False, i.e. never)
         Enforce the letter case of the succeeding charcter.
 
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
     Return:
     -------
     str
@@ -144,28 +371,40 @@ def pressed_twice(word: str,
         from augtxt.typo import pressed_twice
         augm = pressed_twice("Test", loc=['b', 'e'], keep_case=True)
     """
+    return apply_edits(
+        word, pressed_twice_edits(word, loc, keep_case, rng=rng))
+
+
+def pressed_twice_edits(word: Union[str, List[str]],
+                        loc: Optional[Union[int, float, str]] = 'u',
+                        keep_case: Optional[bool] = False,
+                        rng: Optional[np.random.Generator] = None
+                        ) -> List[Edit]:
+    """The edit script of `pressed_twice` (see `apply_edits`)"""
     # abort prematurly
     n_chars = len(word)
     if n_chars == 1:
-        return word + word
+        return [(1, "ins", word[0])]
 
     # find index of the 1st char
-    i = draw_index(n_chars - 1, loc)
+    i = draw_index(n_chars - 1, loc, rng=rng)
+    return _pressed_twice_at(word, i, keep_case)
 
+
+def _pressed_twice_at(word: Union[str, List[str]], i: int,
+                      keep_case: bool) -> List[Edit]:
     # save letter case
-    i2 = min(i + 1, n_chars - 1)
+    i2 = min(i + 1, len(word) - 1)
+    c = word[i]
     if keep_case:
-        case = word[i2].isupper()
-        c = word[i].upper() if case else word[i].lower()
-    else:
-        c = word[i]
-
-    return word[:i2] + c + word[i2:]
+        c = c.upper() if word[i2].isupper() else c.lower()
+    return [(i2, "ins", c)]
 
 
 def drop_char(word: str,
               loc: Optional[Union[int, float, str]] = 'u',
-              keep_case: Optional[bool] = False
+              keep_case: Optional[bool] = False,
+              rng: Optional[np.random.Generator] = None
               ) -> str:
     """Drop a character (dt. Auslasser)
 
@@ -181,6 +420,10 @@ def drop_char(word: str,
         Apply the letter case of the dropped character to the next
           remaining character.
 
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
     Return:
     -------
     str
@@ -191,33 +434,38 @@ def drop_char(word: str,
         from augtxt.typo import drop_char
         augm = drop_char("Test", loc='b', keep_case=False)
     """
+    return apply_edits(word, drop_char_edits(word, loc, keep_case, rng=rng))
+
+
+def drop_char_edits(word: Union[str, List[str]],
+                    loc: Optional[Union[int, float, str]] = 'u',
+                    keep_case: Optional[bool] = False,
+                    rng: Optional[np.random.Generator] = None
+                    ) -> List[Edit]:
+    """The edit script of `drop_char` (see `apply_edits`)"""
     # abort prematurly
     n_chars = len(word)
     if n_chars == 1:
-        return word
+        return []
 
     # find index of the 1st char
-    i = draw_index(n_chars - 1, loc)
+    i = draw_index(n_chars - 1, loc, rng=rng)
+    return _drop_char_at(word, i, keep_case)
 
-    # save letter case
-    if keep_case:
-        case = word[i].isupper()
 
-    # create new word
-    res = word[:i] + word[(i + 1):]
-
-    # enforce dropped letter case on the next charcter
-    if keep_case:
-        res = ''.join([c.upper() if idx == i and case else c
-                       for idx, c in enumerate(res)])
-
-    # done
-    return res
+def _drop_char_at(word: Union[str, List[str]], i: int,
+                  keep_case: bool) -> List[Edit]:
+    # drop the char, and enforce its letter case on the next charcter
+    edits = [(i, "del", "")]
+    if keep_case and word[i].isupper() and i + 1 < len(word):
+        edits.append((i + 1, "sub", word[i + 1].upper()))
+    return edits
 
 
 def drop_n_next_twice(word: str,
                       loc: Optional[Union[int, float, str]] = 'u',
-                      keep_case: Optional[bool] = False
+                      keep_case: Optional[bool] = False,
+                      rng: Optional[np.random.Generator] = None
                       ) -> str:
     """Letter is left out, but the following letter is typed twice
         (dt. Vertipper)
@@ -234,6 +482,10 @@ def drop_n_next_twice(word: str,
         Apply the letter case of the dropped character to the next
           remaining character.
 
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
     Return:
     -------
     str
@@ -244,34 +496,41 @@ def drop_n_next_twice(word: str,
         from augtxt.typo import drop_n_next_twice
         augm = drop_n_next_twice("Test", loc='u', keep_case=False)
     """
+    return apply_edits(
+        word, drop_n_next_twice_edits(word, loc, keep_case, rng=rng))
+
+
+def drop_n_next_twice_edits(word: Union[str, List[str]],
+                            loc: Optional[Union[int, float, str]] = 'u',
+                            keep_case: Optional[bool] = False,
+                            rng: Optional[np.random.Generator] = None
+                            ) -> List[Edit]:
+    """The edit script of `drop_n_next_twice` (see `apply_edits`)"""
     # abort prematurly
     n_chars = len(word)
     if n_chars == 1:
-        return word
+        return []
 
     # find index of the 1st char
-    i = draw_index(n_chars - 2, loc)
-
-    # save letter case
-    if keep_case:
-        case = word[i].isupper()
+    i = draw_index(n_chars - 2, loc, rng=rng)
+    return _drop_n_next_twice_at(word, i, keep_case)
 
-    # create new word
-    i2 = min(i + 1, n_chars - 1)
-    res = word[:i] + word[i2] + word[i2:]
 
-    # enforce dropped letter case on the next charcter
-    if keep_case:
-        res = ''.join([c.upper() if idx == i and case else c
-                       for idx, c in enumerate(res)])
-    # done
-    return res
+def _drop_n_next_twice_at(word: Union[str, List[str]], i: int,
+                          keep_case: bool) -> List[Edit]:
+    # replace the char with the next one, and enforce the dropped letter
+    # case on it
+    c = word[min(i + 1, len(word) - 1)]
+    if keep_case and word[i].isupper():
+        c = c.upper()
+    return [(i, "sub", c)]
 
 
 def pressed_shiftalt(word: str,
                      loc: Optional[Union[int, float, str]] = 'u',
-                     keymap: dict = kbl.macbook_us,
-                     trans: dict = kbl.keyboard_transprob
+                     keymap: Union[dict, kbl.CompiledKeymap] = kbl.macbook_us,
+                     trans: dict = kbl.keyboard_transprob,
+                     rng: Optional[np.random.Generator] = None
                      ) -> str:
     """Typo due to pressing or not pressing SHIFT, ALT, or SHIFT+ALT
 
@@ -283,14 +542,20 @@ def pressed_shiftalt(word: str,
     loc : Union[int, float, str]
         see augtxt.typo.draw_index
 
-    keymap: dict
+    keymap: Union[dict, augtxt.keyboard_layouts.CompiledKeymap]
         A dictionary with four keyboard states as keys ("keys", "shift",
           "alt", "shift+alt"). Each key stores a list of characters.
+          The dict is compiled once, and cached (see
+          `augtxt.keyboard_layouts.compile_keymap`).
 
     trans : dict
         Contains the transitions probabilities from a given keyboard state
           to another.
 
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
     Return:
     -------
     str
@@ -301,22 +566,398 @@ def pressed_shiftalt(word: str,
         from augtxt.typo import pressed_shiftalt
         augm = pressed_shiftalt("Test")
     """
+    return apply_edits(
+        word, pressed_shiftalt_edits(word, loc, keymap, trans, rng=rng))
+
+
+def pressed_shiftalt_edits(word: Union[str, List[str]],
+                           loc: Optional[Union[int, float, str]] = 'u',
+                           keymap: Union[dict, kbl.CompiledKeymap
+                                         ] = kbl.macbook_us,
+                           trans: dict = kbl.keyboard_transprob,
+                           rng: Optional[np.random.Generator] = None
+                           ) -> List[Edit]:
+    """The edit script of `pressed_shiftalt` (see `apply_edits`)"""
     # abort prematurly
     n_chars = len(word)
     if n_chars == 1:
-        return word
+        return []
 
     # find index of the 1st char
-    i = draw_index(n_chars - 1, loc)
+    i = draw_index(n_chars - 1, loc, rng=rng)
 
     # find index and keyboard states in keymap
-    idx, state = kbl.find_index(word[i], keymap)
+    km = kbl.compile_keymap(keymap)
+    idx, state = km.index.get(word[i], (None, None))
     # draw new keyboard state, and lookup new char for given idx
     if idx:
-        newstate = np.random.choice(4, 1, p=trans[state])[0]
-        newstate = tuple(keymap.keys())[newstate]
-        newchar = keymap[newstate][idx]
-        i2 = min(i, n_chars - 1)
-        return word[:i2] + newchar + word[(i2 + 1):]
+        cdf = km.transition_cdf_list(trans)[state]
+        newstate = bisect.bisect_right(cdf, get_rng(rng).random())
+        return _pressed_shiftalt_at(km, i, idx, newstate)
+    else:
+        return []
+
+
+def _pressed_shiftalt_at(km: kbl.CompiledKeymap, i: int, idx: int,
+                         newstate: int) -> List[Edit]:
+    return [(i, "sub", km.table[newstate][idx])]
+
+
+def pressed_neighbour(word: str,
+                      loc: Optional[Union[int, float, str]] = 'u',
+                      keymap: Union[dict, kbl.CompiledKeymap] = kbl.macbook_us,
+                      geometry: Optional[dict] = None,
+                      insert: bool = False,
+                      rng: Optional[np.random.Generator] = None
+                      ) -> str:
+    """Typo due to hitting a neighbouring key ("fat finger")
+
+    The neighbour is drawn with a probability proportional to the inverse
+      squared distance between the keys (see
+      `augtxt.keyboard_layouts.KeyAdjacency`), and has the same keyboard
+      state (e.g. SHIFT) as the original char.
+
+    Parameters:
+    -----------
+    word : str
+        One word token
+
+    loc : Union[int, float, str]
+        see augtxt.typo.draw_index
+
+    keymap: Union[dict, augtxt.keyboard_layouts.CompiledKeymap]
+        see augtxt.typo.pressed_shiftalt
+
+    geometry : dict  (Default: None)
+        The physical key rows of the keymap, e.g.
+          `augtxt.keyboard_layouts.qwertz_de_geometry`. If None, the
+          geometry of a built-in keymap is used.
+
+    insert : bool  (Default: False)
+        If False, the neighbour replaces the char. If True, the neighbour
+          is inserted after the char, i.e. both keys were pressed.
+
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
+    Return:
+    -------
+    str
+        The augmented variant of the input word
+
+    Example:
+    --------
+        from augtxt.typo import pressed_neighbour
+        augm = pressed_neighbour("Test", keymap=kbl.qwertz_de)
+    """
+    return apply_edits(word, pressed_neighbour_edits(
+        word, loc, keymap, geometry, insert, rng=rng))
+
+
+def pressed_neighbour_edits(word: Union[str, List[str]],
+                            loc: Optional[Union[int, float, str]] = 'u',
+                            keymap: Union[dict, kbl.CompiledKeymap
+                                          ] = kbl.macbook_us,
+                            geometry: Optional[dict] = None,
+                            insert: bool = False,
+                            rng: Optional[np.random.Generator] = None
+                            ) -> List[Edit]:
+    """The edit script of `pressed_neighbour` (see `apply_edits`)"""
+    # abort prematurly
+    n_chars = len(word)
+    if n_chars == 1:
+        return []
+
+    # find index of the char
+    i = draw_index(n_chars - 1, loc, rng=rng)
+
+    # find index and keyboard state in keymap, and draw a neighbouring key
+    km = kbl.compile_keymap(keymap)
+    adj = km.adjacency(geometry)
+    idx, state = km.index.get(word[i], (None, None))
+    if idx is None:
+        return []
+    j = adj.sample_one(idx, get_rng(rng).random())
+    return _pressed_neighbour_at(km, i, state, j, insert)
+
+
+def _pressed_neighbour_at(km: kbl.CompiledKeymap, i: int, state: int,
+                          j: int, insert: bool) -> List[Edit]:
+    if j < 0:
+        return []
+    if insert:
+        return [(i + 1, "ins", km.table[state][j])]
+    return [(i, "sub", km.table[state][j])]
+
+
+# upper bound `len(word) - offset` of the random index, and the minimum word
+# length for which an index is drawn at all
+_batch_specs = {
+    'swap_consecutive': (2, 2),
+    'pressed_twice': (1, 2),
+    'drop_char': (1, 2),
+    'drop_n_next_twice': (2, 2),
+    'pressed_shiftalt': (1, 2),
+    'pressed_neighbour': (1, 2),
+}
+
+_typo_functions = {
+    'swap_consecutive': swap_consecutive,
+    'pressed_twice': pressed_twice,
+    'drop_char': drop_char,
+    'drop_n_next_twice': drop_n_next_twice,
+    'pressed_shiftalt': pressed_shiftalt,
+    'pressed_neighbour': pressed_neighbour,
+}
+
+# the edit scripts at a given index, i.e. without random draws
+_edit_builders = {
+    'swap_consecutive': _swap_consecutive_at,
+    'pressed_twice': _pressed_twice_at,
+    'drop_char': _drop_char_at,
+    'drop_n_next_twice': _drop_n_next_twice_at,
+}
+
+_edit_functions = {
+    'swap_consecutive': swap_consecutive_edits,
+    'pressed_twice': pressed_twice_edits,
+    'drop_char': drop_char_edits,
+    'drop_n_next_twice': drop_n_next_twice_edits,
+    'pressed_shiftalt': pressed_shiftalt_edits,
+    'pressed_neighbour': pressed_neighbour_edits,
+}
+
+
+def variants(word: str,
+             fn: Union[str, Callable],
+             loc: Optional[Union[int, float, str]] = 'u',
+             keep_case: Optional[bool] = False,
+             keymap: Union[dict, kbl.CompiledKeymap] = kbl.macbook_us,
+             trans: dict = kbl.keyboard_transprob,
+             geometry: Optional[dict] = None,
+             insert: bool = False
+             ) -> Dict[str, float]:
+    """Enumerate all variants of one typo function and their probabilities
+
+    Instead of calling the random typo function many times, each index
+      that `draw_index` can return (and each keyboard transition of
+      `pressed_shiftalt`, or each neighbour of `pressed_neighbour`) is
+      evaluated once.
+
+    Parameters:
+    -----------
+    word : str
+        One word token
+
+    fn : Union[str, Callable]
+        The typo function, e.g. `augtxt.typo.drop_char`, 'drop_char', or
+          'typo.drop_char'
+
+    loc : Union[int, float, str]
+        see augtxt.typo.draw_index
+
+    keep_case : bool  (Default False, i.e. never)
+        see the single-word typo functions. Ignored by `pressed_shiftalt`
+          and `pressed_neighbour`.
+
+    keymap: dict
+        see augtxt.typo.pressed_shiftalt
+
+    trans : dict
+        see augtxt.typo.pressed_shiftalt
+
+    geometry : dict
+        see augtxt.typo.pressed_neighbour
+
+    insert : bool
+        see augtxt.typo.pressed_neighbour
+
+    Return:
+    -------
+    Dict[str, float]
+        The distinct variants and their exact probabilities (sorted by
+          probability). The unchanged word is a variant too, e.g. if
+          `pressed_shiftalt` picks a char that is not in the keymap.
+
+    Example:
+    --------
+        from augtxt.typo import variants
+        variants("Kinder", "swap_consecutive", loc='m')
+        # {'Kidner': 0.375, 'Knider': 0.25, 'Kinedr': 0.25, ...}
+    """
+    name = (fn if isinstance(fn, str) else fn.__name__).split('.')[-1]
+    if name not in _batch_specs:
+        raise Exception(f"Unknown typo function: '{name}'")
+    offset, minlen = _batch_specs[name]
+    func = _typo_functions[name]
+
+    # short words are not augmented at random
+    n_chars = len(word)
+    if n_chars < minlen:
+        if name == 'pressed_shiftalt':
+            return {func(word, loc=0, keymap=keymap, trans=trans): 1.0}
+        if name == 'pressed_neighbour':
+            return {func(word, loc=0, keymap=keymap, geometry=geometry,
+                         insert=insert): 1.0}
+        return {func(word, loc=0, keep_case=keep_case): 1.0}
+
+    probs = {}
+    if name == 'pressed_shiftalt':
+        km = kbl.compile_keymap(keymap)
+        cdfs = km.transition_cdf_list(trans)
+    elif name == 'pressed_neighbour':
+        km = kbl.compile_keymap(keymap)
+        adj = km.adjacency(geometry)
+    for i, pi in enumerate(index_pmf(n_chars - offset, loc)):
+        if pi <= 0.0:
+            continue
+        if name == 'pressed_neighbour':
+            # enumerate the neighbouring keys
+            idx, state = km.index.get(word[i], (None, None))
+            neighbours, pn = adj.neighbours(idx) if idx is not None \
+                else ([], [])
+            if len(neighbours) == 0:
+                probs[word] = probs.get(word, 0.0) + pi
+                continue
+            for j, pj in zip(neighbours.tolist(), pn.tolist()):
+                c = km.table[state][j]
+                res = word[:(i + 1)] + c + word[(i + 1):] if insert \
+                    else word[:i] + c + word[(i + 1):]
+                probs[res] = probs.get(res, 0.0) + pi * pj
+            continue
+        if name != 'pressed_shiftalt':
+            res = func(word, loc=i, keep_case=keep_case)
+            probs[res] = probs.get(res, 0.0) + pi
+            continue
+        # enumerate the new keyboard states
+        idx, state = km.index.get(word[i], (None, None))
+        if not idx:
+            probs[word] = probs.get(word, 0.0) + pi
+            continue
+        prev = 0.0
+        for newstate, c in enumerate(cdfs[state]):
+            if c > prev:
+                res = word[:i] + km.table[newstate][idx] + word[(i + 1):]
+                probs[res] = probs.get(res, 0.0) + pi * (c - prev)
+            prev = c
+    return dict(sorted(probs.items(), key=lambda kv: -kv[1]))
+
+
+def batch(fn: Union[str, Callable],
+          words: Union[List[str], np.ndarray],
+          loc: Optional[Union[int, float, str]] = 'u',
+          keep_case: Optional[bool] = False,
+          keymap: Union[dict, kbl.CompiledKeymap] = kbl.macbook_us,
+          trans: dict = kbl.keyboard_transprob,
+          geometry: Optional[dict] = None,
+          insert: bool = False,
+          rng: Optional[np.random.Generator] = None
+          ) -> np.ndarray:
+    """Apply one typo function to a whole array of words
+
+    Parameters:
+    -----------
+    fn : Union[str, Callable]
+        The typo function, e.g. `augtxt.typo.drop_char`, 'drop_char', or
+          'typo.drop_char'
+
+    words : Union[List[str], np.ndarray]
+        A list or NumPy string array of word tokens
+
+    loc : Union[int, float, str]
+        see augtxt.typo.draw_index
+
+    keep_case : bool  (Default False, i.e. never)
+        see the single-word typo functions. Ignored by `pressed_shiftalt`
+          and `pressed_neighbour`.
+
+    keymap: dict
+        see augtxt.typo.pressed_shiftalt
+
+    trans : dict
+        see augtxt.typo.pressed_shiftalt
+
+    geometry : dict
+        see augtxt.typo.pressed_neighbour
+
+    insert : bool
+        see augtxt.typo.pressed_neighbour
+
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
+
+    Return:
+    -------
+    np.ndarray
+        The augmented variants of the input words. For a given seed, the
+          result is the same as calling the single-word function for each
+          word. The only exceptions are `pressed_shiftalt` and
+          `pressed_neighbour` with a random `loc` because the single-word
+          function draws location and key alternately. All locations,
+          keyboard transitions, and neighbouring keys are drawn in one go,
+          and the words are built with the same edit scripts as the
+          single-word functions (e.g. `augtxt.typo.drop_char_edits`).
+
+    Example:
+    --------
+        from augtxt.typo import batch
+        np.random.seed(seed=42)
+        augm = batch('swap_consecutive', ["Kinder", "Eltern", "A"], loc='m')
+    """
+    name = (fn if isinstance(fn, str) else fn.__name__).split('.')[-1]
+    if name not in _batch_specs:
+        raise Exception(f"Unknown typo function: '{name}'")
+    offset, minlen = _batch_specs[name]
+
+    # draw all locations in one go
+    res = [str(w) for w in words]
+    lens = np.array([len(w) for w in res], dtype=np.int64)
+    eligible = np.where(lens >= minlen)[0]
+    indices = draw_indices(lens[eligible] - offset, loc, rng=rng).tolist()
+    pairs = zip(eligible.tolist(), indices)
+
+    if name == 'pressed_shiftalt':
+        # lookup all chars, and draw all keyboard transitions in one go
+        km = kbl.compile_keymap(keymap)
+        found = []
+        for k, i in pairs:
+            idx, state = km.index.get(res[k][i], (None, None))
+            if idx:
+                found.append((k, i, idx, state))
+        u = get_rng(rng).random(len(found))
+        newstates = km.sample_states(trans, [f[3] for f in found], u)
+        for (k, i, idx, _), s in zip(found, newstates.tolist()):
+            res[k] = apply_edits(res[k], _pressed_shiftalt_at(km, i, idx, s))
+
+    elif name == 'pressed_neighbour':
+        # lookup all chars, and draw all neighbouring keys in one go
+        km = kbl.compile_keymap(keymap)
+        adj = km.adjacency(geometry)
+        found = []
+        for k, i in pairs:
+            idx, state = km.index.get(res[k][i], (None, None))
+            if idx is not None:
+                found.append((k, i, idx, state))
+        u = get_rng(rng).random(len(found))
+        keys = adj.sample(np.array([f[2] for f in found], dtype=np.int64), u)
+        for (k, i, _, state), j in zip(found, keys.tolist()):
+            res[k] = apply_edits(
+                res[k], _pressed_neighbour_at(km, i, state, j, insert))
+
     else:
-        return word
+        # the edits of a builder are already sorted
+        build = _edit_builders[name]
+        for k, i in pairs:
+            res[k] = _apply_sorted_edits(res[k], build(res[k], i, keep_case))
+        # short words are not augmented at random (e.g. single chars are
+        # always doubled by `pressed_twice`)
+        edits = _edit_functions[name]
+        for k in np.where((lens >= 1) & (lens < minlen))[0].tolist():
+            res[k] = apply_edits(res[k], edits(res[k], loc=0,
+                                               keep_case=keep_case))
+
+    if isinstance(words, np.ndarray) and words.dtype == object:
+        return np.array(res, dtype=object)
+    return np.array(res, dtype=str)
@@ -1,14 +1,136 @@
-from typing import Optional, List, Dict, Union
-import scipy.stats
+from typing import Optional, List, Dict, Union, Iterable, Iterator, Tuple
+import numpy as np
+from augtxt.rng import get_rng
 import copy
 import itertools
 import warnings
 
 
-warnings.warn(
-    "`augtxt.wordsubs` will be deleted in 0.6.0 and replaced.",
-    DeprecationWarning
-)
+# the deprecation warning is raised on first use, not on import
+_warned = False
+
+
+def _warn_deprecated():
+    global _warned
+    if not _warned:
+        _warned = True
+        warnings.warn(
+            "`augtxt.wordsubs` will be deleted in 0.6.0 and replaced.",
+            DeprecationWarning, stacklevel=3)
+
+
+def _ncomb(n: int, k: int) -> int:
+    """The binomial coefficient `n` choose `k`"""
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    c = 1
+    for i in range(k):
+        c = c * (n - i) // (i + 1)
+    return c
+
+
+def _sample_combos(availidx: List[int], n_low: int, n_high: int,
+                   num_augm: int, rng=None) -> List[tuple]:
+    """Draw up to `num_augm` distinct index combinations at random
+
+    Each combination of `n_low` to `n_high` indices has the same
+      probability. Subsets are drawn directly (a subset size weighted by
+      its number of combinations, and then a random subset), and
+      duplicates are rejected. Only if there are hardly more combinations
+      than `num_augm`, they are enumerated.
+    """
+    n_avail = len(availidx)
+    sizes = list(range(n_low, min(n_high, n_avail) + 1))
+    counts = [_ncomb(n_avail, k) for k in sizes]
+    total = sum(counts)
+    if total == 0:
+        return []
+
+    # few combinations: enumerate and shuffle them
+    if total <= 2 * num_augm:
+        combos = []
+        for num in sizes:
+            combos.extend(itertools.combinations(availidx, num))
+        perm = get_rng(rng).permutation(len(combos))
+        return [combos[i] for i in perm[:num_augm]]
+
+    # many combinations: rejection sampling (acceptance rate >= 1/2)
+    p = [c / total for c in counts]
+    combos, seen = [], set()
+    while len(combos) < num_augm:
+        k = sizes[get_rng(rng).choice(len(sizes), p=p)]
+        idx = get_rng(rng).choice(n_avail, size=k, replace=False)
+        combo = tuple(availidx[i] for i in sorted(idx))
+        if combo not in seen:
+            seen.add(combo)
+            combos.append(combo)
+    return combos
+
+
+def _augment_seq(seq: List[str],
+                 synonyms: Dict[str, List[str]],
+                 num_augm: int,
+                 min_repl: Union[int, float],
+                 max_repl: Union[int, float],
+                 keep_case: bool,
+                 sampling: str,
+                 rng) -> Iterator[List[str]]:
+    """Yield the augmentations of one sequence"""
+    # token indicies that are available to augment
+    availidx = [i for i, word in enumerate(seq)
+                if word.lower() in synonyms]
+    n_avail = len(availidx)
+
+    if n_avail >= 1:
+        # determine the number of words to replace
+        n_seqlen = len(seq)
+
+        if isinstance(min_repl, int):
+            n_low = max(1, min(n_avail, min_repl))
+        elif isinstance(min_repl, float):
+            n_low = max(1, min(n_avail, int(n_seqlen * min_repl)))
+
+        if isinstance(max_repl, int):
+            n_high = max(n_low, min(n_seqlen, max_repl))
+        elif isinstance(max_repl, float):
+            n_high = max(n_low, min(n_avail, int(n_seqlen * max_repl)))
+
+        # find the combinations of token indicies that can be replaced
+        if sampling == "random":
+            combos = _sample_combos(
+                availidx, n_low, n_high, num_augm, rng=rng)
+        else:
+            combos = []
+            for num in range(n_low, n_high + 1):
+                combos.extend(list(itertools.combinations(availidx, num)))
+        n_combos = len(combos)
+
+        if n_combos > 0:
+            # Generate augmentations for the current sentence
+            for q in range(num_augm):
+                # copy original seqs
+                tmp = copy.copy(seq)
+                # pick the next combination of indicies
+                indices = combos[q % n_combos]
+                # for each augmentable token
+                for i in indices:
+                    # memorize if it's a capital letter
+                    if keep_case:
+                        iscap = seq[i][0].isupper()
+                    # get synonyms (Use the orginal sequencen `seq`!)
+                    word = seq[i].lower()
+                    if word in synonyms:
+                        syns = synonyms[word]
+                        if syns:  # if there are any synonyms
+                            # pick random synonym (And store into `tmp`)
+                            j = get_rng(rng).integers(0, len(syns))
+                            tmp[i] = syns[j]
+                            # transform capital letter
+                            if keep_case:
+                                if iscap:
+                                    tmp[i] = tmp[i][0].upper() + tmp[i][1:]
+                yield tmp
 
 
 def synonym_replacement(original_seqs: List[List[str]],
@@ -16,7 +138,9 @@ def synonym_replacement(original_seqs: List[List[str]],
                         num_augm: int,
                         min_repl: Union[int, float] = 1,
                         max_repl: Union[int, float] = 1.0,
-                        keep_case: Optional[bool] = False
+                        keep_case: Optional[bool] = False,
+                        sampling: str = "roundrobin",
+                        rng: Optional[np.random.Generator] = None
                         ) -> List[List[List[str]]]:
     """Replace words with synonyms
 
@@ -24,7 +148,8 @@ def synonym_replacement(original_seqs: List[List[str]],
         A list of tokenized sequences.
 
     synonyms: Dict[str, List[str]]
-        Synonym dictionary
+        Synonym dictionary, or a memory-mapped
+          `augtxt.synonyms.SynonymIndex`
 
     num_augm: int
         Target number of random augmentations per sequence
@@ -37,66 +162,79 @@ def synonym_replacement(original_seqs: List[List[str]],
 
     keep_case : bool  (Default False, i.e. never)
         Enforce the original letter cases on the new string.
+
+    sampling : str  (Default: "roundrobin")
+        How the combinations of replaced token indicies are picked
+        - "roundrobin": Enumerate all combinations, and take them in turn.
+            Deterministic, but the time and memory grow exponentially with
+            the number of replaceable tokens.
+        - "random": Draw `num_augm` distinct combinations at random in
+            O(num_augm * k). If there are fewer combinations than
+            `num_augm`, they are repeated in turn.
+
+    rng : np.random.Generator  (Default: None)
+        The random number generator. If None, the global `np.random`
+          state is used.
     """
+    _warn_deprecated()
+    if sampling not in ("roundrobin", "random"):
+        raise ValueError(f"Unknown sampling: '{sampling}'")
+
     augmented_seqs = []
     for seq in original_seqs:
-        # save all augmentations of the current sequences in a tmp list
-        curaug = []
-
-        # token indicies that are available to augment
-        availidx = [i for i, word in enumerate(seq)
-                    if word.lower() in synonyms.keys()]
-        n_avail = len(availidx)
-
-        if n_avail >= 1:
-            # determine the number of words to replace
-            n_seqlen = len(seq)
-
-            if isinstance(min_repl, int):
-                n_low = max(1, min(n_avail, min_repl))
-            elif isinstance(min_repl, float):
-                n_low = max(1, min(n_avail, int(n_seqlen * min_repl)))
+        augmented_seqs.append(list(_augment_seq(
+            seq, synonyms, num_augm, min_repl, max_repl, keep_case,
+            sampling, rng)))
+    return augmented_seqs
 
-            if isinstance(max_repl, int):
-                n_high = max(n_low, min(n_seqlen, max_repl))
-            elif isinstance(max_repl, float):
-                n_high = max(n_low, min(n_avail, int(n_seqlen * max_repl)))
 
-            # find all combinations of token indicies that can be replaced
-            combos = []
-            for num in range(n_low, n_high + 1):
-                combos.extend(list(itertools.combinations(availidx, num)))
-            n_combos = len(combos)
-
-            if n_combos > 0:
-                # Generate augmentations for the current sentence
-                for q in range(num_augm):
-                    # copy original seqs
-                    tmp = copy.copy(seq)
-                    # pick the next combination of indicies
-                    indices = combos[q % n_combos]
-                    # for each augmentable token
-                    for i in indices:
-                        # memorize if it's a capital letter
-                        if keep_case:
-                            iscap = seq[i][0].isupper()
-                        # get synonyms (Use the orginal sequencen `seq`!)
-                        word = seq[i].lower()
-                        if word in synonyms.keys():
-                            syns = synonyms[word]
-                            if syns:  # if there are any synonyms
-                                # pick random synonym (And store into `tmp`)
-                                j = scipy.stats.randint.rvs(0, len(syns))
-                                tmp[i] = syns[j]
-                                # transform capital letter
-                                if keep_case:
-                                    if iscap:
-                                        tmp[i] = tmp[i][0].upper() + tmp[i][1:]
-                    # save results
-                    curaug.append(tmp)
-
-        # save results
-        augmented_seqs.append(curaug)
-
-    # done
-    return augmented_seqs
+def synonym_replacement_stream(original_seqs: Iterable[List[str]],
+                               synonyms: Dict[str, List[str]],
+                               num_augm: int,
+                               min_repl: Union[int, float] = 1,
+                               max_repl: Union[int, float] = 1.0,
+                               keep_case: Optional[bool] = False,
+                               sampling: str = "roundrobin",
+                               rng: Optional[np.random.Generator] = None
+                               ) -> Iterator[Tuple[int, List[str]]]:
+    """Replace words with synonyms, and yield each augmentation lazily
+
+    The same as `synonym_replacement` but the sequences are read from any
+      iterable (e.g. a file reader), and each augmented sequence is
+      yielded as soon as it's generated. Nothing is computed before the
+      consumer asks for the next item, i.e. the memory usage does not
+      depend on the size of the corpus.
+
+    Parameters:
+    -----------
+    original_seqs: Iterable[List[str]]
+        The tokenized sequences. The iterable is consumed lazily.
+
+    synonyms, num_augm, min_repl, max_repl, keep_case, sampling, rng
+        see augtxt.wordsubs.synonym_replacement
+
+    Return:
+    -------
+    Iterator[Tuple[int, List[str]]]
+        The index of the original sequence, and an augmented sequence.
+          A sequence without replaceable tokens yields nothing.
+
+    Example:
+    --------
+        import itertools
+        from augtxt.wordsubs import synonym_replacement_stream
+        stream = synonym_replacement_stream(
+            reader, synonyms, num_augm=3, rng=np.random.default_rng(42))
+        # consume chunks of 256 augmented sequences
+        while True:
+            chunk = list(itertools.islice(stream, 256))
+            if not chunk:
+                break
+    """
+    _warn_deprecated()
+    if sampling not in ("roundrobin", "random"):
+        raise ValueError(f"Unknown sampling: '{sampling}'")
+    for idx, seq in enumerate(original_seqs):
+        for aug in _augment_seq(seq, synonyms, num_augm, min_repl, max_repl,
+                                keep_case, sampling, rng):
+            yield idx, aug
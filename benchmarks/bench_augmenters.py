@@ -0,0 +1,117 @@
+import pytest
+import numpy as np
+import augtxt.augmenters
+import corpus
+
+typo_settings = [
+    {'weight': 2, 'p': 0.04, 'fn': 'typo.drop_n_next_twice',
+     'args': {'loc': ['m', 'e'], 'keep_case': True}},
+    {'weight': 2, 'p': 0.04, 'fn': 'typo.swap_consecutive',
+     'args': {'loc': ['m', 'e'], 'keep_case': True}},
+    {'weight': 1, 'p': 0.02, 'fn': 'typo.pressed_twice',
+     'args': {'loc': 'u', 'keep_case': True}},
+    {'weight': 1, 'p': 0.02, 'fn': 'typo.drop_char',
+     'args': {'loc': ['m', 'e'], 'keep_case': True}},
+    {'weight': 1, 'p': 0.02, 'fn': 'typo.pressed_shiftalt',
+     'args': {'loc': ['b', 'm'], 'keymap': 'qwertz_de'}},
+]
+
+order_settings = [
+    {'weight': 3, 'fn': 'order.swap_consecutive'},
+    {'weight': 2, 'fn': 'order.drop_word'},
+    {'weight': 1, 'fn': 'order.write_twice'},
+    {'weight': 1, 'fn': 'order.drop_n_next_twice'},
+]
+
+sentaugm_settings = {
+    "typo": {"num_augmentations": 6, "settings": typo_settings, "pmax": 0.1},
+    "punct": {"num_augmentations": 3},
+    "order": {"num_augmentations": 6, "settings": order_settings}
+}
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [1000, 10000])
+def bench_wordtypo(measure, num, lang):
+    words = corpus.words(lang, num)
+    plan = augtxt.augmenters.AugmentationPlan(typo_settings)
+    np.random.seed(seed=42)
+    measure(lambda: [augtxt.augmenters.wordtypo(w, plan) for w in words],
+            words=num)
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [100, 1000])
+def bench_senttypo(measure, num, lang):
+    sentences = corpus.sentences(lang, num)
+    plan = augtxt.augmenters.AugmentationPlan(typo_settings)
+    np.random.seed(seed=42)
+    measure(lambda: [augtxt.augmenters.senttypo(
+        s, plan, exclude=["[MASK]"], num_augmentations=6)
+        for s in sentences], sentences=num)
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [100, 1000])
+def bench_sentaugm(measure, num, lang):
+    sentences = corpus.sentences(lang, num)
+    settings = augtxt.augmenters.compile_sentaugm_settings(sentaugm_settings)
+    np.random.seed(seed=42)
+    measure(lambda: [augtxt.augmenters.sentaugm(s, settings, ["[MASK]"])
+                     for s in sentences], sentences=num)
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [1000, 10000])
+def bench_wordtypo_cached(measure, num, lang):
+    words = corpus.words(lang, num)
+    plan = augtxt.augmenters.AugmentationPlan(typo_settings)
+    cache = augtxt.augmenters.TypoCache(maxsize=5000)
+    np.random.seed(seed=42)
+    measure(lambda: [augtxt.augmenters.wordtypo(w, plan, cache=cache)
+                     for w in words], words=num)
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [100, 1000])
+def bench_senttypo_cached(measure, num, lang):
+    sentences = corpus.sentences(lang, num)
+    plan = augtxt.augmenters.AugmentationPlan(typo_settings)
+    cache = augtxt.augmenters.TypoCache(maxsize=5000)
+    np.random.seed(seed=42)
+    measure(lambda: [augtxt.augmenters.senttypo(
+        s, plan, exclude=["[MASK]"], num_augmentations=6, cache=cache)
+        for s in sentences], sentences=num)
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [1000, 10000])
+def bench_wordtypo_batch(measure, num, lang):
+    words = corpus.words(lang, num)
+    plan = augtxt.augmenters.AugmentationPlan(typo_settings)
+    np.random.seed(seed=42)
+    measure(lambda: augtxt.augmenters.wordtypo_batch(words, plan),
+            words=num)
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [1000, 10000])
+def bench_wordtypo_multi(measure, num, lang):
+    # several typos per word
+    words = corpus.words(lang, num)
+    plan = augtxt.augmenters.AugmentationPlan(
+        [dict(item, p=0.5) for item in typo_settings])
+    np.random.seed(seed=42)
+    measure(lambda: [augtxt.augmenters.wordtypo(w, plan) for w in words],
+            words=num)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.parametrize("num", [1000])
+def bench_senttypo_many(measure, num, workers):
+    from augtxt.parallel import senttypo_many
+    sentences = corpus.sentences("de", num)
+    plan = augtxt.augmenters.AugmentationPlan(typo_settings)
+    measure(lambda: senttypo_many(
+        sentences, plan, exclude=["[MASK]"], num_augmentations=6,
+        workers=workers, seed=42), sentences=num)
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("module", [
+    None, "augtxt.typo", "augtxt.augmenters", "augtxt.parallel",
+    "augtxt.cli"])
+def bench_import(benchmark, module):
+    # a fresh interpreter per import; `None` is the interpreter and numpy
+    code = "import numpy" if module is None else f"import {module}"
+    benchmark.pedantic(
+        subprocess.run, args=([sys.executable, "-c", code],),
+        kwargs={"check": True, "cwd": root}, rounds=10, warmup_rounds=1)
+
+
+def bench_import_vs_numpy(benchmark):
+    # the augmenters import in less time than numpy itself (i.e. without
+    # heavy dependencies like scipy)
+    code = ("import time\n"
+            "t0 = time.perf_counter()\n"
+            "import numpy\n"
+            "t1 = time.perf_counter()\n"
+            "import augtxt.augmenters, augtxt.parallel, augtxt.cli\n"
+            "t2 = time.perf_counter()\n"
+            "print(t1 - t0, t2 - t1)\n")
+    times = []
+
+    def run():
+        proc = subprocess.run([sys.executable, "-c", code], check=True,
+                              cwd=root, capture_output=True, text=True)
+        times.append([float(t) for t in proc.stdout.split()])
+
+    benchmark.pedantic(run, rounds=10, warmup_rounds=1)
+    t_numpy = min(t for t, _ in times)
+    t_augtxt = min(t for _, t in times)
+    benchmark.extra_info["numpy_sec"] = t_numpy
+    benchmark.extra_info["augtxt_sec"] = t_augtxt
+    assert t_augtxt < t_numpy, (t_augtxt, t_numpy)
@@ -0,0 +1,16 @@
+import pytest
+import numpy as np
+import augtxt.order
+import corpus
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [100, 1000])
+@pytest.mark.parametrize("name", [
+    "swap_consecutive", "drop_word", "write_twice", "drop_n_next_twice"])
+def bench_order(measure, name, num, lang):
+    sentences = corpus.sentences(lang, num)
+    fn = getattr(augtxt.order, name)
+    np.random.seed(seed=42)
+    measure(lambda: [fn(s, exclude=["[MASK]"], num_aug=1)
+                     for s in sentences], sentences=num)
@@ -0,0 +1,30 @@
+import pytest
+import numpy as np
+import augtxt.punct
+import corpus
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [100, 1000])
+def bench_merge_words(measure, num, lang):
+    sentences = corpus.sentences(lang, num)
+    np.random.seed(seed=42)
+    measure(lambda: [augtxt.punct.merge_words(s, num_aug=1)
+                     for s in sentences], sentences=num)
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [100, 1000])
+def bench_remove_syntaxinfo(measure, num, lang):
+    sentences = corpus.sentences(lang, num)
+    measure(lambda: [augtxt.punct.remove_syntaxinfo(s) for s in sentences],
+            sentences=num)
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num_aug", [10, 1000])
+def bench_merge_words_document(measure, num_aug, lang):
+    document = " ".join(corpus.sentences(lang, 1000))
+    np.random.seed(seed=42)
+    measure(lambda: augtxt.punct.merge_words(document, num_aug=num_aug),
+            words=len(document.split()))
@@ -0,0 +1,33 @@
+import pytest
+import numpy as np
+import augtxt.typo
+import augtxt.keyboard_layouts as kbl
+import corpus
+
+fns = ["swap_consecutive", "pressed_twice", "drop_char",
+       "drop_n_next_twice", "pressed_shiftalt", "pressed_neighbour"]
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [1000, 10000])
+@pytest.mark.parametrize("name", fns)
+def bench_word(measure, name, num, lang):
+    words = corpus.words(lang, num)
+    fn = getattr(augtxt.typo, name)
+    np.random.seed(seed=42)
+    measure(lambda: [fn(w, loc='u') for w in words], words=num)
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [1000, 10000])
+@pytest.mark.parametrize("name", fns)
+def bench_batch(measure, name, num, lang):
+    words = corpus.words(lang, num)
+    np.random.seed(seed=42)
+    measure(lambda: augtxt.typo.batch(name, words, loc='u'), words=num)
+
+
+def bench_find_index(measure):
+    chars = list("".join(corpus.words("de", 1000)))
+    measure(lambda: [kbl.find_index(c, kbl.qwertz_de) for c in chars],
+            words=len(chars))
@@ -0,0 +1,19 @@
+import warnings
+import pytest
+import numpy as np
+import corpus
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    import augtxt.wordsubs
+
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+@pytest.mark.parametrize("num", [100, 1000])
+def bench_synonym_replacement(measure, num, lang):
+    seqs = corpus.tokenized(lang, num)
+    synonyms = corpus.synonyms(lang)
+    np.random.seed(seed=42)
+    measure(lambda: augtxt.wordsubs.synonym_replacement(
+        seqs, synonyms, num_augm=5, max_repl=2, keep_case=True),
+        sentences=num)
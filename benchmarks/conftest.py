@@ -0,0 +1,41 @@
+import sys
+import os
+import tracemalloc
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+
+def peak_memory(fn) -> int:
+    """Peak memory in bytes allocated by Python while calling `fn`"""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+@pytest.fixture
+def measure(benchmark):
+    """Run a benchmark, and record throughput and peak memory
+
+    Example:
+    --------
+        def bench_fn(measure):
+            measure(lambda: [fn(w) for w in words], words=len(words))
+    """
+    def run(fn, words: int = None, sentences: int = None):
+        # `--benchmark-disable` runs `fn` once, and records nothing
+        if benchmark.disabled:
+            return benchmark(fn)
+        benchmark.extra_info["peak_memory_kib"] = peak_memory(fn) / 1024
+        result = benchmark(fn)
+        mean = benchmark.stats.stats.mean
+        if words:
+            benchmark.extra_info["words_per_sec"] = words / mean
+        if sentences:
+            benchmark.extra_info["sentences_per_sec"] = sentences / mean
+        return result
+    return run
@@ -0,0 +1,62 @@
+from typing import List
+import numpy as np
+
+vocab = {
+    "de": [
+        "Die", "der", "das", "ein", "eine", "Lehrerin", "Schülerin", "Roman",
+        "Aufsatz", "Straße", "Kinder", "Eltern", "Tante", "Blume", "Haus",
+        "schreibt", "liest", "geht", "sieht", "kauft", "sehr", "schön",
+        "groß", "klein", "heute", "morgen", "und", "oder", "aber", "nicht",
+        "Bindestrich-Wörter", "Fußgängerzone", "Bahnhof", "Wetter", "Buch",
+        "Zeitung", "Arbeit", "Mittagessen", "Wochenende", "Fahrrad",
+        "über", "unter", "neben", "mit", "für", "gegen", "ohne", "durch",
+    ],
+    "en": [
+        "The", "the", "a", "an", "teacher", "student", "novel", "essay",
+        "street", "children", "parents", "aunt", "flower", "house",
+        "writes", "reads", "goes", "sees", "buys", "very", "nice", "big",
+        "small", "today", "tomorrow", "and", "or", "but", "not", "station",
+        "well-known", "pedestrian", "weather", "book", "newspaper", "work",
+        "lunch", "weekend", "bicycle", "over", "under", "next", "with",
+        "for", "against", "without", "through", "quickly",
+    ]
+}
+
+
+def words(lang: str, num: int, seed: int = 42) -> List[str]:
+    """Draw `num` random words of a synthetic vocabulary"""
+    rng = np.random.default_rng(seed)
+    vocab_ = vocab[lang]
+    # Zipf-like word frequencies
+    p = 1.0 / np.arange(1, len(vocab_) + 1)
+    return [vocab_[i] for i in rng.choice(len(vocab_), num, p=p / p.sum())]
+
+
+def sentences(lang: str, num: int, seed: int = 42) -> List[str]:
+    """Generate `num` random sentences of 5 to 15 words"""
+    rng = np.random.default_rng(seed)
+    pool = words(lang, num * 15, seed=seed)
+    result, pos = [], 0
+    for _ in range(num):
+        n = int(rng.integers(5, 16))
+        token = pool[pos:pos + n]
+        pos += n
+        if rng.random() < 0.3:
+            token[int(rng.integers(0, n))] = "[MASK]"
+        if n > 6 and rng.random() < 0.5:
+            token[n // 2] += ","
+        result.append(" ".join(token) + rng.choice([".", "!", "?"]))
+    return result
+
+
+def tokenized(lang: str, num: int, seed: int = 42) -> List[List[str]]:
+    """Generate `num` random whitespace-tokenized sequences"""
+    return [s[:-1].replace(",", "").split(" ") + [s[-1]]
+            for s in sentences(lang, num, seed)]
+
+
+def synonyms(lang: str) -> dict:
+    """A pseudo-synonym dictionary for the synthetic vocabulary"""
+    vocab_ = sorted(set(w.lower() for w in vocab[lang]))
+    return {w: [vocab_[(i + k) % len(vocab_)] for k in range(1, 6)]
+            for i, w in enumerate(vocab_)}
@@ -29,8 +29,10 @@ setup(name='augtxt',
       packages=['augtxt'],
       install_requires=[
           'numpy>=1.19.0,<2',
-          'scipy>=1.5.4,<2',
           'kshingle>=0.6.1,<1'
       ],
-      python_requires='>=3.6',
+      entry_points={
+          'console_scripts': ['augtxt=augtxt.cli:main']
+      },
+      python_requires='>=3.7',
       zip_safe=True)
@@ -0,0 +1,58 @@
+from augtxt.augmenters import (
+    AugmentationPlan, wordtypo, senttypo, sentaugm,
+    compile_sentaugm_settings)
+import numpy as np
+import pytest
+
+settings = [
+    {'weight': 2, 'p': 0.3, 'fn': 'typo.drop_n_next_twice',
+     'args': {'loc': ['m', 'e'], 'keep_case': True}},
+    {'weight': 1, 'p': 0.3, 'fn': 'typo.swap_consecutive',
+     'args': {'loc': ['b', 'm', 'e'], 'keep_case': True}},
+]
+
+
+def test1():
+    plan = AugmentationPlan(settings)
+    np.random.seed(seed=42)
+    a = [wordtypo("Blume", settings) for _ in range(50)]
+    np.random.seed(seed=42)
+    b = [wordtypo("Blume", plan) for _ in range(50)]
+    assert a == b
+
+
+def test2():
+    plan = AugmentationPlan(settings)
+    sentence = 'Die Lehrerin [MASK] einen Roman.'
+    np.random.seed(seed=42)
+    a = senttypo(sentence, settings, exclude=["[MASK]"], num_augmentations=5)
+    np.random.seed(seed=42)
+    b = senttypo(sentence, plan, exclude=["[MASK]"], num_augmentations=5)
+    assert a == b
+
+
+def test3():
+    with pytest.raises(ValueError):
+        AugmentationPlan([{'weight': 1, 'fn': 'typo.unknown'}])
+    with pytest.raises(ValueError):
+        AugmentationPlan([{'weight': -1, 'fn': 'typo.drop_char'}])
+    plan = AugmentationPlan([{'p': 0.1, 'fn': 'typo.drop_char'}])
+    with pytest.raises(ValueError):
+        senttypo("Ein Satz.", plan)
+
+
+def test4():
+    cfg = {
+        "typo": {"num_augmentations": 2, "settings": settings},
+        "order": {"num_augmentations": 2, "settings": [
+            {'weight': 1, 'fn': 'order.swap_consecutive'}]}
+    }
+    compiled = compile_sentaugm_settings(cfg)
+    assert isinstance(compiled["typo"]["settings"], AugmentationPlan)
+    assert isinstance(compiled["order"]["settings"], AugmentationPlan)
+    sentence = 'Die Lehrerin [MASK] einen Roman.'
+    np.random.seed(seed=42)
+    a = sentaugm(sentence, cfg)
+    np.random.seed(seed=42)
+    b = sentaugm(sentence, compiled)
+    assert sorted(a) == sorted(b)
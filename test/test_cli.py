@@ -0,0 +1,79 @@
+from augtxt.cli import main
+import json
+import os
+import subprocess
+import sys
+
+settings = {
+    "typo": {"num_augmentations": 2, "settings": [
+        {"weight": 1, "fn": "typo.drop_char",
+         "args": {"loc": "u", "keep_case": True}},
+        {"weight": 1, "fn": "typo.pressed_shiftalt",
+         "args": {"loc": ["b", "m"], "keymap": "qwertz_de"}}]},
+    "punct": {"num_augmentations": 1},
+    "order": {"num_augmentations": 1, "settings": [
+        {"weight": 1, "fn": "order.drop_word"}]}
+}
+
+
+def test1(tmp_path):
+    fsettings = tmp_path / "settings.json"
+    fsettings.write_text(json.dumps(settings))
+    finput = tmp_path / "input.txt"
+    finput.write_text(
+        "Die Lehrerin [MASK] einen Roman.\n\nDies ist ein Satz.\n")
+    foutput = tmp_path / "output.jsonl"
+    args = [str(finput), "-s", str(fsettings), "-o", str(foutput),
+            "--seed", "42", "--buffer-size", "1"]
+    assert main(args) == 0
+    rows = [json.loads(line) for line in foutput.read_text().splitlines()]
+    assert [r["original"] for r in rows] == [
+        "Die Lehrerin [MASK] einen Roman.", "Dies ist ein Satz."]
+    assert all(len(r["augmentations"]) > 0 for r in rows)
+    # reproducible
+    main(args[:-4] + ["-o", str(tmp_path / "again.jsonl"), "--seed", "42"])
+    assert (tmp_path / "again.jsonl").read_text() == foutput.read_text()
+
+
+def test2(tmp_path, capsys):
+    fsettings = tmp_path / "settings.json"
+    fsettings.write_text(json.dumps(settings["typo"]))
+    finput = tmp_path / "input.jsonl"
+    finput.write_text(json.dumps({"id": 1, "text": "Die Lehrerin."}) + "\n")
+    main([str(finput), "-s", str(fsettings), "-m", "senttypo",
+          "--input-format", "jsonl", "--output-format", "tsv"])
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    assert all(line.startswith("Die Lehrerin.\t") for line in lines)
+
+
+def test3(tmp_path, capsys):
+    # wordtypo with a plain list of settings
+    fsettings = tmp_path / "settings.json"
+    fsettings.write_text(json.dumps([
+        {"p": 1.0, "fn": "typo.drop_char", "args": {"loc": 0}}]))
+    finput = tmp_path / "input.txt"
+    finput.write_text("Kinder\nEltern\n")
+    assert main([str(finput), "-s", str(fsettings), "-m", "wordtypo",
+                 "-n", "3"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert rows == [
+        {"original": "Kinder", "augmentations": ["inder"] * 3},
+        {"original": "Eltern", "augmentations": ["ltern"] * 3}]
+
+
+def test4(tmp_path):
+    # read from stdin
+    fsettings = tmp_path / "settings.json"
+    fsettings.write_text(json.dumps(settings))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-m", "augtxt.cli", "-s", str(fsettings),
+         "--seed", "42", "--output-format", "tsv"],
+        input="Die Lehrerin [MASK] einen Roman.\n", cwd=root,
+        capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    lines = proc.stdout.splitlines()
+    assert len(lines) > 0
+    assert all(line.startswith("Die Lehrerin [MASK] einen Roman.\t")
+               for line in lines)
@@ -0,0 +1,72 @@
+from augtxt.augmenters import docaugm
+import augtxt.tokenizer
+import concurrent.futures
+import numpy as np
+
+settings = {
+    "typo": {"num_augmentations": 2, "pmax": 0.1, "settings": [
+        {'weight': 1, 'fn': 'typo.swap_consecutive',
+         'args': {'loc': 'u', 'keep_case': True}}]},
+    "order": {"num_augmentations": 2, "settings": [
+        {'weight': 1, 'fn': 'order.drop_word'}]}
+}
+
+document = ("Die Lehrerin [MASK] einen Roman.  Die Schülerin schreibt "
+            "einen Aufsatz!\n\nDer Aufsatz ist gut.")
+
+
+def test1():
+    spans = augtxt.tokenizer.segment(document)
+    assert [document[a:b] for a, b in spans] == [
+        "Die Lehrerin [MASK] einen Roman.",
+        "Die Schülerin schreibt einen Aufsatz!",
+        "Der Aufsatz ist gut."]
+
+
+def test2():
+    augs = docaugm(document, settings, num_augmentations=5, budget=1,
+                   seed=42)
+    assert len(augs) == 5
+    spans = augtxt.tokenizer.segment(document)
+    for aug in augs:
+        assert aug != document
+        # the original spacing is kept
+        assert "  " in aug and "\n\n" in aug
+        # one sentence is changed
+        changed = [document[a:b] not in aug for a, b in spans]
+        assert sum(changed) == 1
+
+
+def test3():
+    a = docaugm(document, settings, num_augmentations=4, budget=None,
+                seed=7)
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        b = docaugm(document, settings, num_augmentations=4, budget=None,
+                    executor=executor, seed=7)
+    with concurrent.futures.ProcessPoolExecutor(2) as executor:
+        c = docaugm(document, settings, num_augmentations=4, budget=None,
+                    executor=executor, seed=7)
+    assert a == b == c
+
+
+def test4():
+    typo = settings["typo"]["settings"]
+    augs = docaugm(document, typo, num_augmentations=3, budget=2,
+                   method="senttypo", seed=np.random.SeedSequence(1))
+    assert len(augs) == 3
+    assert docaugm("", settings) == []
+    try:
+        docaugm(document, settings, method="wordtypo")
+        assert False
+    except ValueError:
+        pass
+
+
+def test5():
+    # the same results for any chunk size
+    a = docaugm(document, settings, num_augmentations=4, budget=None,
+                seed=7)
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        b = docaugm(document, settings, num_augmentations=4, budget=None,
+                    executor=executor, seed=7, chunksize=1)
+    assert a == b
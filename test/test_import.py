@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-W", "error", "-c", code], cwd=root,
+        capture_output=True, text=True)
+
+
+def test1():
+    # neither scipy nor process pools are loaded by the augmenters
+    proc = run(
+        "import sys\n"
+        "import augtxt.augmenters, augtxt.parallel, augtxt.cli\n"
+        "assert 'scipy' not in sys.modules\n"
+        "assert 'concurrent.futures' not in sys.modules\n"
+        "assert 'asyncio' not in sys.modules\n")
+    assert proc.returncode == 0, proc.stderr
+
+
+def test2():
+    # importing the deprecated module does not warn
+    proc = run("import augtxt.wordsubs")
+    assert proc.returncode == 0, proc.stderr
+    # but using it does
+    proc = run("import augtxt.wordsubs as w\n"
+               "w.synonym_replacement([['a']], {'a': ['b']}, 1)")
+    assert "DeprecationWarning" in proc.stderr
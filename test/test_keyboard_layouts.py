@@ -0,0 +1,68 @@
+import augtxt.keyboard_layouts as kbl
+from augtxt.typo import pressed_shiftalt
+import numpy as np
+import bisect
+
+
+def linear_find_index(c, keymap):
+    for mode in keymap.keys():
+        if c in keymap[mode]:
+            return keymap[mode].index(c), mode
+    return None, None
+
+
+def test1():
+    for keymap in (kbl.macbook_us, kbl.qwertz_de):
+        for chars in keymap.values():
+            for c in chars:
+                assert kbl.find_index(c, keymap) == linear_find_index(
+                    c, keymap)
+    assert kbl.find_index("Ж", kbl.qwertz_de) == (None, None)
+
+
+def test2():
+    km = kbl.compile_keymap(kbl.qwertz_de)
+    assert km is kbl.compile_keymap(kbl.qwertz_de)
+    assert km is kbl.compile_keymap(km)
+    idx, state = km.index["k"]
+    assert km.table[1][idx] == "K"
+    cdf = km.transition_cdf(kbl.keyboard_transprob)
+    assert cdf.shape == (4, 4)
+    assert np.allclose(cdf[:, -1], 1.0)
+
+
+def test3():
+    np.random.seed(seed=42)
+    a = [pressed_shiftalt("Onkel", loc='u', keymap=kbl.qwertz_de)
+         for _ in range(20)]
+    np.random.seed(seed=42)
+    km = kbl.compile_keymap(kbl.qwertz_de)
+    b = [pressed_shiftalt("Onkel", loc='u', keymap=km) for _ in range(20)]
+    assert a == b
+
+
+def test4():
+    # keymaps and transition probabilities built per call do not leak
+    for _ in range(100):
+        keymap = {k: list(v) for k, v in kbl.qwertz_de.items()}
+        km = kbl.compile_keymap(keymap)
+        assert km is kbl.compile_keymap(keymap)
+        km.transition_cdf(dict(kbl.keyboard_transprob))
+        assert len(km._cdfs) == 1
+    assert len(kbl._compiled) <= kbl._compiled.maxsize
+    km = kbl.compile_keymap(kbl.qwertz_de)
+    for _ in range(100):
+        km.transition_cdf(dict(kbl.keyboard_transprob))
+    assert len(km._cdfs) <= km._cdfs.maxsize
+
+
+def test5():
+    # vectorized transitions match the single draws of pressed_shiftalt
+    km = kbl.compile_keymap(kbl.qwertz_de)
+    cdf = km.transition_cdf_list(kbl.keyboard_transprob)
+    rng = np.random.default_rng(42)
+    states = rng.integers(0, 4, 1000)
+    u = np.concatenate([rng.random(996), [0.0, 0.75, 0.95, 0.999]])
+    newstates = km.sample_states(kbl.keyboard_transprob, states, u)
+    assert newstates.tolist() == [
+        bisect.bisect_right(cdf[s], x) for s, x in zip(states, u)]
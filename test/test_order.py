@@ -40,3 +40,37 @@ def test_follow1():
         text, exclude=["[MASK]"], num_aug=1)
     target = "die die Wörter, lasse sie weg, oder [MASK] was."
     assert augmented == target
+
+
+def test_pretokenized1():
+    tokens = ["Die", "Frau", ",", "die", "[MASK]", "steht", "."]
+    text = " ".join(tokens)
+    for fn in [augtxt.order.swap_consecutive, augtxt.order.drop_word,
+               augtxt.order.write_twice, augtxt.order.drop_n_next_twice]:
+        for seed in range(5):
+            augm = fn(tokens, num_aug=2, rng=np.random.default_rng(seed))
+            assert isinstance(augm, list)
+            assert "[MASK]" in augm
+            assert augm.count(",") == 1 and augm[-1] == "."
+            # the same words are augmented as in the string
+            expected = fn(text, num_aug=2, rng=np.random.default_rng(seed))
+            assert augtxt.order._cleanup(" ".join(augm), ".,;:!?") \
+                == expected
+
+
+def test_augmenter1():
+    text = "Die Frau , die [MASK] da steht ; oder?"
+    augmenter = augtxt.order.OrderAugmenter(exclude=["[MASK]"], punct=".;?")
+    misses = augtxt.order._punct_pattern.cache_info().misses
+    for name in ["swap_consecutive", "drop_word", "write_twice",
+                 "drop_n_next_twice"]:
+        fn = getattr(augtxt.order, name)
+        for seed in range(3):
+            a = getattr(augmenter, name)(
+                text, num_aug=2, rng=np.random.default_rng(seed))
+            b = fn(text, exclude=["[MASK]"], punct=".;?", num_aug=2,
+                   rng=np.random.default_rng(seed))
+            assert a == b
+            assert " ;" not in a and "[MASK]" in a
+    # the patterns are compiled once per punctuation set
+    assert augtxt.order._punct_pattern.cache_info().misses == misses
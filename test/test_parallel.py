@@ -0,0 +1,113 @@
+from augtxt.parallel import sentaugm_corpus
+
+settings = {
+    "typo": {"num_augmentations": 2, "settings": [
+        {'weight': 1, 'fn': 'typo.drop_char',
+         'args': {'loc': 'u', 'keep_case': True}},
+        {'weight': 1, 'fn': 'typo.swap_consecutive',
+         'args': {'loc': 'u', 'keep_case': True}}]},
+    "punct": {"num_augmentations": 1},
+    "order": {"num_augmentations": 2, "settings": [
+        {'weight': 1, 'fn': 'order.swap_consecutive'},
+        {'weight': 1, 'fn': 'order.drop_word'}]}
+}
+
+sentences = [
+    "Die Lehrerin [MASK] einen Roman.",
+    "Tausche die Wörter, lasse sie weg, oder [MASK] was.",
+    "Die Bindestrich-Wörter sind da.",
+] * 7
+
+
+def test1():
+    a = list(sentaugm_corpus(
+        sentences, settings, workers=1, chunksize=4, seed=42))
+    b = list(sentaugm_corpus(
+        iter(sentences), settings, workers=2, chunksize=4, seed=42))
+    assert len(a) == len(sentences)
+    assert a == b
+
+
+def test2():
+    a = list(sentaugm_corpus(
+        sentences, settings, workers=1, chunksize=4, seed=42))
+    # the 1st shard does not depend on later shards
+    b = list(sentaugm_corpus(
+        sentences[:4], settings, workers=1, chunksize=4, seed=42))
+    assert a[:4] == b
+
+
+typo_settings = settings["typo"]["settings"]
+
+
+def test3():
+    from augtxt.parallel import senttypo_many
+    a = senttypo_many(sentences, typo_settings, exclude=["[MASK]"],
+                      num_augmentations=2, workers=1, chunksize=4, seed=42)
+    b = senttypo_many(iter(sentences), typo_settings, exclude=["[MASK]"],
+                      num_augmentations=2, workers=3, chunksize=4, seed=42)
+    assert len(a) == len(sentences)
+    assert a == b
+    assert all(len(augs) == 2 for augs in a)
+    assert all("[MASK]" in aug for augs in a[::3] for aug in augs)
+
+
+def test4():
+    from augtxt.parallel import senttypo_many
+    tokens = ["Die", "Frau", ",", "die", "da", "steht", "."]
+    a = senttypo_many([tokens, "[MASK]"], typo_settings,
+                      exclude=["[MASK]"], seed=42)
+    assert a[1] == []
+    assert isinstance(a[0][0], list)
+    assert a[0][0][2] == "," and a[0][0][6] == "."
+
+
+def test5():
+    import asyncio
+    from augtxt.parallel import sentaugm_async
+    read = []
+
+    async def reader():
+        for s in sentences:
+            read.append(s)
+            await asyncio.sleep(0)
+            yield s
+
+    async def consume():
+        results = []
+        async for original, augs in sentaugm_async(
+                reader(), settings, workers=1, chunksize=2, max_in_flight=3,
+                seed=42):
+            # backpressure: at most `max_in_flight` chunks read ahead
+            assert len(read) - len(results) <= 3 * 2
+            results.append((original, augs))
+        return results
+
+    a = asyncio.run(consume())
+    assert len(a) == len(sentences)
+    assert sorted([o for o, _ in a]) == sorted(sentences)
+
+
+def test6():
+    import asyncio
+    from augtxt.parallel import sentaugm_async
+
+    async def consume(**kwargs):
+        return [item async for item in sentaugm_async(
+            sentences, settings, chunksize=4, seed=42, **kwargs)]
+
+    # per-chunk random streams, i.e. independent of the executor and the
+    # completion order
+    a = asyncio.run(consume(workers=1, max_in_flight=1))
+    b = asyncio.run(consume(workers=2))
+    assert [o for o, _ in a] == sentences
+    assert sorted(a) == sorted(b)
+    # the same streams as `sentaugm_corpus`
+    c = list(sentaugm_corpus(
+        sentences, settings, workers=1, chunksize=4, seed=42))
+    assert [augs for _, augs in a] == c
+    # an existing executor
+    import concurrent.futures
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        d = asyncio.run(consume(executor=executor))
+    assert sorted(a) == sorted(d)
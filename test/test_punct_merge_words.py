@@ -1,5 +1,6 @@
 from augtxt.punct import merge_words
 import numpy as np
+import warnings
 
 
 def test1():
@@ -14,3 +15,29 @@ def test2():
     text = ""
     augmented = merge_words(text)
     assert augmented == ''
+
+
+def test3():
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        augmented = merge_words("Ende-", rng=np.random.default_rng(0))
+    assert augmented == "Ende-"
+    assert len(w) == 1
+
+
+def test4():
+    # separators next to excluded strings are kept
+    text = "Die Lehrerin [MASK] einen Roman-Klassiker."
+    for seed in range(20):
+        augmented = merge_words(text, num_aug=3,
+                                rng=np.random.default_rng(seed))
+        assert " [MASK] " in augmented
+
+
+def test5():
+    # many merges on a long text
+    text = " ".join(["Ein Wort"] * 5000) + "."
+    augmented = merge_words(text, num_aug=20000,
+                            rng=np.random.default_rng(1))
+    assert len(augmented) < len(text) - 5000
+    assert augmented.replace(" ", "").lower() == text.replace(" ", "").lower()
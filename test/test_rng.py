@@ -0,0 +1,46 @@
+from augtxt.augmenters import senttypo, wordtypo
+from augtxt.rng import spawn
+import augtxt.order
+import augtxt.punct
+import augtxt.typo
+import numpy as np
+
+settings = [
+    {'weight': 1, 'p': 0.5, 'fn': 'typo.drop_char',
+     'args': {'loc': 'u', 'keep_case': True}},
+    {'weight': 1, 'p': 0.5, 'fn': 'typo.pressed_shiftalt',
+     'args': {'loc': ['b', 'm']}},
+]
+sentence = "Tausche die Wörter, lasse sie weg, oder [MASK] was."
+
+
+def run(rng):
+    return (
+        senttypo(sentence, settings, num_augmentations=3, rng=rng),
+        [wordtypo("Blume", settings, rng=rng) for _ in range(5)],
+        augtxt.order.drop_word(sentence, num_aug=2, rng=rng),
+        augtxt.punct.merge_words(sentence, rng=rng),
+        augtxt.typo.batch('swap_consecutive', ["Kinder"] * 3, rng=rng)
+    )
+
+
+def test1():
+    a = run(np.random.default_rng(42))
+    b = run(np.random.default_rng(42))
+    assert str(a) == str(b)
+
+
+def test2():
+    # the global state is not used
+    np.random.seed(seed=1)
+    run(np.random.default_rng(42))
+    x = np.random.random_sample()
+    np.random.seed(seed=1)
+    assert x == np.random.random_sample()
+
+
+def test3():
+    a = [rng.integers(0, 2**32) for rng in spawn(42, 4)]
+    b = [rng.integers(0, 2**32) for rng in spawn(42, 4)]
+    assert a == b
+    assert len(set(a)) == 4
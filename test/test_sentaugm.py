@@ -0,0 +1,56 @@
+from augtxt.augmenters import sentaugm
+from augtxt.tokenizer import tokenize
+import numpy as np
+import pytest
+
+settings = {
+    "typo": {"num_augmentations": 4, "settings": [
+        {'weight': 1, 'fn': 'typo.drop_char',
+         'args': {'loc': 'u', 'keep_case': True}},
+        {'weight': 1, 'fn': 'typo.pressed_twice',
+         'args': {'loc': 'u', 'keep_case': True}}]},
+    "punct": {"num_augmentations": 2},
+    "order": {"num_augmentations": 3, "settings": [
+        {'weight': 1, 'fn': 'order.swap_consecutive'},
+        {'weight': 1, 'fn': 'order.write_twice'}]}
+}
+
+
+def test1():
+    sentence = "Tausche die Wörter, lasse sie weg, oder [MASK] was."
+    augs, stats = sentaugm(sentence, settings, rng=np.random.default_rng(1),
+                           return_stats=True)
+    assert len(augs) == 9
+    assert len(set(augs)) == len(augs)
+    assert sentence not in augs
+    assert stats["missing"] == {"typo": 0, "punct": 0, "order": 0}
+    assert sum(stats["draws"].values()) - sum(stats["wasted"].values()) == 9
+    # reproducible
+    assert augs == sentaugm(sentence, settings, rng=np.random.default_rng(1))
+
+
+def test2():
+    """Only the short families are retried"""
+    cfg = dict(settings)
+    cfg["order"] = {"num_augmentations": 3, "settings": [
+        {'weight': 1, 'fn': 'order.swap_consecutive'}]}
+    augs, stats = sentaugm("Hallo", cfg, max_retries=2,
+                           rng=np.random.default_rng(1), return_stats=True)
+    assert stats["missing"]["order"] == 3
+    assert stats["draws"]["order"] == 3 * 3
+    assert stats["wasted"]["order"] == 3 * 3
+    assert stats["missing"]["typo"] == 0
+    assert stats["draws"]["typo"] == 4 + stats["wasted"]["typo"]
+    assert len(augs) == 4 + 2 - stats["missing"]["punct"]
+
+
+def test3():
+    # pretokenized token lists are rejected with a clear error
+    tokens = ["Die", "Frau", ",", "die", "da", "steht", "."]
+    with pytest.raises(ValueError):
+        sentaugm(tokens, settings, rng=np.random.default_rng(1))
+    # tokenized sentences are augmented as their text
+    sent = tokenize("Die Frau, die da steht.")
+    a = sentaugm(sent, settings, rng=np.random.default_rng(1))
+    b = sentaugm(sent.text, settings, rng=np.random.default_rng(1))
+    assert a == b
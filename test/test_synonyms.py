@@ -0,0 +1,54 @@
+from augtxt.synonyms import SynonymIndex
+import numpy as np
+import pickle
+import warnings
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from augtxt.wordsubs import synonym_replacement
+
+synonyms = {
+    'anderer': ['verschiedener', 'einiger', 'vieler'],
+    'satz': ['sätze', 'anfangssatz', 'schlussatz'],
+    'sätze': ['satz'],
+    '.': [',', '🎅'],
+    'das': ['welches', 'solches'],
+    'dass': [],
+    'ein': ['weiteres'],
+}
+
+
+def test1(tmp_path):
+    index = SynonymIndex.build(synonyms, str(tmp_path / "idx"))
+    assert len(index) == len(synonyms)
+    assert sorted(index.keys()) == sorted(synonyms.keys())
+    for key, syns in synonyms.items():
+        assert key in index
+        assert index[key] == syns
+    assert "da" not in index
+    assert "dasss" not in index
+    assert index.get("Satz") is None
+    # reopen in another process
+    index2 = pickle.loads(pickle.dumps(index))
+    assert index2["sätze"] == ["satz"]
+
+
+def test2(tmp_path):
+    index = SynonymIndex.build(synonyms, str(tmp_path / "idx"))
+    seqs = [["Das", "ist", "ein", "anderer", "Satz", "."]]
+    np.random.seed(seed=42)
+    a = synonym_replacement(seqs, synonyms, num_augm=5, keep_case=True)
+    np.random.seed(seed=42)
+    b = synonym_replacement(seqs, index, num_augm=5, keep_case=True)
+    assert a == b
+
+
+def test3(tmp_path):
+    # the mmap flag survives pickling
+    index = SynonymIndex.build(synonyms, str(tmp_path / "idx"), mmap=False)
+    index2 = pickle.loads(pickle.dumps(index))
+    assert index2.mmap is False
+    assert not isinstance(index2._strings, np.memmap)
+    assert index2["satz"] == synonyms["satz"]
+    index3 = pickle.loads(pickle.dumps(SynonymIndex.load(index.path)))
+    assert isinstance(index3._strings, np.memmap)
@@ -0,0 +1,48 @@
+from augtxt.tokenizer import tokenize
+from augtxt.augmenters import senttypo
+import augtxt.order
+import augtxt.punct
+
+
+def test1():
+    sent = tokenize("Die Lehrerin [MASK] einen Roman.")
+    assert sent.tokens == ["Die", "Lehrerin", "[MASK]", "einen", "Roman"]
+    assert sent.spans == [(0, 3), (4, 12), (13, 19), (20, 25), (26, 31)]
+    assert sent.rebuild({1: "Lehrer", 4: "Brief"}) == (
+        "Die Lehrer [MASK] einen Brief.")
+    assert sent.rebuild(sent.tokens) == sent.text
+    assert tokenize(sent) is sent
+
+
+def test2():
+    """Repeated substrings are not replaced at the wrong position"""
+    settings = [{'weight': 1, 'fn': 'typo.drop_char', 'args': {'loc': 0}}]
+    augm = senttypo("Lehrerin in Berlin.", settings,
+                    exclude=["Lehrerin", "Berlin"])
+    assert augm == ["Lehrerin n Berlin."]
+
+
+def test3():
+    text = "Lehrerin in Berlin."
+    sent = tokenize(text)
+    exclude = ["Lehrerin", "Berlin"]
+    assert augtxt.order.drop_word(sent, exclude=exclude) == "Lehrerin Berlin."
+    assert augtxt.order.write_twice(text, exclude=exclude) == (
+        "Lehrerin in in Berlin.")
+    assert augtxt.punct.remove_syntaxinfo(sent) == "Lehrerin in Berlin"
+
+
+def test4():
+    tokens = ["Die", "Frau", ",", "die", "da", "steht", "."]
+    sent = tokenize(tokens)
+    assert sent.tokens == ["Die", "Frau", "die", "da", "steht"]
+    assert sent.rebuild({2: "dei"}) == [
+        "Die", "Frau", ",", "dei", "da", "steht", "."]
+    assert sent.rebuild({0: [], 4: ["steht", "steht"]}) == [
+        "Frau", ",", "die", "da", "steht", "steht", "."]
+    augm = senttypo(tokens, [{'weight': 1, 'fn': 'typo.drop_char',
+                              'args': {'loc': 'u'}}], num_augmentations=3)
+    for aug in augm:
+        assert len(aug) == len(tokens)
+        assert aug[2] == "," and aug[6] == "."
+        assert sum([a != b for a, b in zip(aug, tokens)]) == 1
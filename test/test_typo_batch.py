@@ -0,0 +1,38 @@
+import augtxt.typo
+import augtxt.keyboard_layouts as kbl
+import numpy as np
+import pytest
+
+words = ["Kinder", "A", "Eltern", "Straße", "Ab", "Tante", "BLUME", "zu"]
+
+
+@pytest.mark.parametrize("fn", [
+    augtxt.typo.swap_consecutive, augtxt.typo.pressed_twice,
+    augtxt.typo.drop_char, augtxt.typo.drop_n_next_twice])
+def test1(fn):
+    for loc in ('u', 'b', 'e', 0.3, 1):
+        for keep_case in (False, True):
+            np.random.seed(seed=42)
+            target = [fn(w, loc=loc, keep_case=keep_case) for w in words]
+            np.random.seed(seed=42)
+            augm = augtxt.typo.batch(
+                fn, words, loc=loc, keep_case=keep_case)
+            assert augm.tolist() == target
+
+
+def test2():
+    np.random.seed(seed=23)
+    target = [augtxt.typo.pressed_shiftalt(w, loc=1, keymap=kbl.qwertz_de)
+              for w in words]
+    np.random.seed(seed=23)
+    augm = augtxt.typo.batch(
+        'typo.pressed_shiftalt', np.array(words), loc=1,
+        keymap=kbl.qwertz_de)
+    assert augm.tolist() == target
+
+
+def test3():
+    augm = augtxt.typo.batch(
+        'pressed_twice', np.array(["Eltern", "A"], dtype=object), loc=4)
+    assert augm.dtype == object
+    assert augm.tolist() == ["Elterrn", "AA"]
@@ -0,0 +1,91 @@
+from augtxt.augmenters import (
+    AugmentationPlan, TypoCache, senttypo, wordtypo, typo_variants,
+    wordtypo_variants)
+import numpy as np
+import collections
+import pytest
+
+settings = [
+    {'p': 0.3, 'weight': 2, 'fn': 'typo.drop_n_next_twice',
+     'args': {'loc': ['m', 'e'], 'keep_case': True}},
+    {'p': 0.4, 'weight': 1, 'fn': 'typo.swap_consecutive',
+     'args': {'loc': ['m', 'e'], 'keep_case': True}},
+    {'p': 0.2, 'weight': 1, 'fn': 'typo.pressed_shiftalt',
+     'args': {'loc': 'u'}}]
+
+
+def test1():
+    plan = AugmentationPlan(settings)
+    cache = TypoCache(maxsize=2)
+    cache.warm(["Satz", "Blume", "Kinder"], plan)
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (0, 2)
+    cache.table("Satz", plan)
+    assert (cache.hits, cache.misses) == (1, 2)
+    # "Blume" is the least recently used, and evicted
+    cache.table("Kinder", plan)
+    cache.table("Satz", plan)
+    assert (cache.hits, cache.misses) == (2, 3)
+    cache.table("Blume", plan)
+    assert (cache.hits, cache.misses) == (2, 4)
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 0
+
+
+def test2():
+    # exact probabilities of all `wordtypo` variants
+    plan = AugmentationPlan(settings)
+    v = wordtypo_variants("Satz", plan)
+    np.testing.assert_allclose(sum(v.values()), 1.0)
+    # each function changes "Satz"
+    np.testing.assert_allclose(v["Satz"], 0.7 * 0.6 * 0.8)
+    assert "Satz" not in typo_variants("Satz", plan)
+
+
+def test3():
+    # the cached draws have the same distribution
+    plan = AugmentationPlan(settings)
+    cache = TypoCache()
+    rng = np.random.default_rng(42)
+    n = 50000
+    v = wordtypo_variants("Satz", plan)
+    freq = collections.Counter(
+        [wordtypo("Satz", plan, rng=rng, cache=cache) for _ in range(n)])
+    assert set(freq).issubset(set(v))
+    for w, p in v.items():
+        assert abs(freq[w] / n - p) < 0.01
+
+    v = typo_variants("Satz", plan)
+    freq = collections.Counter(senttypo(
+        "Satz", plan, num_augmentations=n, rng=rng, cache=cache))
+    assert set(freq).issubset(set(v))
+    for w, p in v.items():
+        assert abs(freq[w] / n - p) < 0.01
+
+
+def test4():
+    plan = AugmentationPlan(settings)
+    sentence = "Die Lehrerin [MASK] einen Roman."
+    a = senttypo(sentence, plan, exclude=["[MASK]"], num_augmentations=5,
+                 rng=np.random.default_rng(1), cache=TypoCache())
+    b = senttypo(sentence, plan, exclude=["[MASK]"], num_augmentations=5,
+                 rng=np.random.default_rng(1), cache=TypoCache())
+    assert a == b
+    for aug in a:
+        assert aug.startswith("Die") or aug.startswith("Dei") \
+            or aug.startswith("Dee") or aug.startswith("Ide")
+        assert "[MASK]" in aug
+
+
+def test5():
+    # raw settings are compiled per call, and would never hit the cache
+    cache = TypoCache()
+    with pytest.raises(ValueError):
+        senttypo("Die Lehrerin liest.", settings, cache=cache)
+    with pytest.raises(ValueError):
+        wordtypo("Satz", settings, cache=cache)
+    assert len(cache) == 0
+    plan = AugmentationPlan(settings)
+    for _ in range(5):
+        senttypo("Satz", plan, cache=cache)
+    assert (cache.hits, cache.misses) == (4, 1)
@@ -0,0 +1,37 @@
+from augtxt.typo import draw_index, draw_indices, IndexBuffer, drop_char
+import numpy as np
+import pytest
+
+
+def test1():
+    n = np.array([5, 0, 3, 11, 1, 7])
+    for loc in ('u', 'b', 'm', 'e', 0.3):
+        np.random.seed(seed=42)
+        target = [draw_index(k, loc) for k in n]
+        np.random.seed(seed=42)
+        idx = draw_indices(n, loc)
+        assert idx.tolist() == target
+
+
+def test2():
+    idx = draw_indices(np.array([5, 0, 3]), loc=4)
+    assert idx.tolist() == [4, 0, 3]
+
+
+def test3():
+    words = ["Straße", "Eltern", "Tante"]
+    buf = IndexBuffer([0, 5, 123])
+    augm = [drop_char(w, loc=buf) for w in words]
+    assert augm == ["traße", "Elter", "Tant"]
+    assert len(buf) == 0
+    with pytest.raises(IndexError):
+        drop_char("Kinder", loc=buf)
+
+
+def test4():
+    words = ["Straße", "Eltern", "Tante"]
+    np.random.seed(seed=23)
+    target = [drop_char(w, loc='m') for w in words]
+    np.random.seed(seed=23)
+    buf = IndexBuffer.fill([len(w) - 1 for w in words], loc='m')
+    assert [drop_char(w, loc=buf) for w in words] == target
@@ -0,0 +1,77 @@
+from augtxt.typo import (
+    apply_edits, apply_edits_inplace, swap_consecutive_edits,
+    drop_char_edits, pressed_twice_edits, drop_n_next_twice_edits,
+    swap_consecutive, drop_char)
+from augtxt.augmenters import AugmentationPlan, wordtypo
+import numpy as np
+
+
+def test1():
+    edits = [(3, "del", ""), (0, "sub", "k"), (6, "ins", "s")]
+    assert apply_edits("Kinder", edits) == "kiners"
+    assert apply_edits(list("Kinder"), edits) == "kiners"
+    assert "".join(apply_edits_inplace(list("Kinder"), edits)) == "kiners"
+    assert apply_edits("Kinder", []) == "Kinder"
+    # insert before a substitution of the same position
+    edits = [(1, "sub", "a"), (1, "ins", "x")]
+    assert apply_edits("Kinder", edits) == "Kxander"
+    assert "".join(apply_edits_inplace(list("Kinder"), edits)) == "Kxander"
+
+
+def test2():
+    assert swap_consecutive_edits("Kinder", loc=0, keep_case=True) == [
+        (0, "sub", "I"), (1, "sub", "k")]
+    assert pressed_twice_edits("A", loc=0) == [(1, "ins", "A")]
+    assert drop_char_edits("Kinder", loc=0, keep_case=True) == [
+        (0, "del", ""), (1, "sub", "I")]
+    assert drop_n_next_twice_edits("Kinder", loc=0, keep_case=True) == [
+        (0, "sub", "I")]
+    assert drop_char_edits("A", loc=0) == []
+
+
+def test3():
+    for word in ["Kinder", "Eltern", "ab", "Übermut"]:
+        for loc in range(len(word)):
+            for keep_case in (False, True):
+                res = swap_consecutive(word, loc=loc, keep_case=keep_case)
+                edits = swap_consecutive_edits(
+                    list(word), loc=loc, keep_case=keep_case)
+                assert res == apply_edits(word, edits)
+                res = drop_char(word, loc=loc, keep_case=keep_case)
+                edits = drop_char_edits(word, loc=loc, keep_case=keep_case)
+                assert res == "".join(apply_edits_inplace(list(word), edits))
+
+
+def sequential(word, plan, rng):
+    # apply one typo function after another on the string
+    result = word
+    for i in rng.permutation(len(plan)):
+        if plan.p[i] >= rng.random():
+            cfg = plan.draw_args(i, rng=rng)
+            result = plan.fns[i](result, rng=rng, **cfg)
+    return result
+
+
+def test4():
+    # the fused edits are the same as applying one function after another,
+    # also if a new char is several chars long (e.g. 'ß'.upper() == 'SS')
+    plan = AugmentationPlan([
+        {'p': 0.7, 'fn': 'typo.drop_n_next_twice',
+         'args': {'loc': 'u', 'keep_case': True}},
+        {'p': 0.7, 'fn': 'typo.swap_consecutive',
+         'args': {'loc': 'u', 'keep_case': True}},
+        {'p': 0.7, 'fn': 'typo.pressed_twice',
+         'args': {'loc': 'u', 'keep_case': True}},
+        {'p': 0.7, 'fn': 'typo.drop_char',
+         'args': {'loc': 'u', 'keep_case': True}}])
+    for word in ["Kinder", "Aß", "STRAßE", "İstanbul", "ﬁNDEN"]:
+        for seed in range(100):
+            res = wordtypo(word, plan, rng=np.random.default_rng(seed))
+            assert res == sequential(word, plan, np.random.default_rng(seed))
+
+
+def test5():
+    edits = [(1, "sub", "SS"), (2, "ins", "SS")]
+    assert apply_edits("Aßb", edits) == "ASSSSb"
+    assert "".join(apply_edits_inplace(list("Aßb"), edits)) == "ASSSSb"
+    assert len(apply_edits_inplace(list("Aßb"), edits)) == 6
@@ -0,0 +1,69 @@
+from augtxt.typo import pressed_neighbour, batch, variants
+import augtxt.keyboard_layouts as kbl
+import numpy as np
+import pytest
+
+
+def test1():
+    augm = pressed_neighbour("Onkel", loc=2, keymap=kbl.qwertz_de)
+    assert augm in ("Onjel", "Onlel", "Oniel", "Onoel", "Onmel", "On,el")
+    augm = pressed_neighbour("Onkel", loc=2, insert=True)
+    assert augm[:3] == "Onk" and augm[4:] == "el"
+
+
+def test2():
+    # the neighbour has the same keyboard state
+    augm = pressed_neighbour("OnKel", loc=2, keymap=kbl.qwertz_de)
+    assert augm in ("OnJel", "OnLel", "OnIel", "OnOel", "OnMel", "On;el")
+    assert pressed_neighbour("Ж", loc=0) == "Ж"
+    assert pressed_neighbour("aЖ", loc=1) == "aЖ"
+
+
+def test3():
+    km = kbl.compile_keymap(kbl.qwertz_de)
+    adj = km.adjacency()
+    assert adj is km.adjacency(kbl.qwertz_de_geometry)
+    assert len(adj) == len(km.table[0])
+    for idx in range(len(adj)):
+        neighbours, probs = adj.neighbours(idx)
+        assert len(neighbours) > 0
+        assert idx not in neighbours
+        assert np.isclose(probs.sum(), 1.0)
+    idx, _ = km.index["g"]
+    neighbours, _ = adj.neighbours(idx)
+    assert sorted(km.table[0][j] for j in neighbours) == \
+        ["b", "f", "h", "t", "v", "z"]
+    with pytest.raises(ValueError):
+        kbl.compile_keymap(kbl.qwertz_de).adjacency(kbl.macbook_us_geometry)
+
+
+def test4():
+    km = kbl.compile_keymap(kbl.macbook_us)
+    adj = km.adjacency()
+    idx, _ = km.index["g"]
+    neighbours, probs = adj.neighbours(idx)
+    # vectorized sampling matches the probabilities
+    drawn = adj.sample(np.full(100000, idx), np.random.default_rng(42)
+                       .random(100000))
+    freq = np.bincount(drawn, minlength=len(adj))[neighbours] / 100000
+    assert np.allclose(freq, probs, atol=0.01)
+
+
+def test5():
+    rng = np.random.default_rng(42)
+    res = batch("pressed_neighbour", ["Hallo"] * 10000, loc=0, rng=rng)
+    v = variants("Hallo", "pressed_neighbour", loc=0)
+    assert set(res) <= set(v.keys())
+    assert np.isclose(sum(v.values()), 1.0)
+    assert np.isclose(np.mean(res == "Jallo"), v["Jallo"], atol=0.02)
+
+
+def test6():
+    words = ["Kinder", "A", "Eltern", "Straße", "Ab", "TANTE", "ЖЖ"]
+    for insert in (False, True):
+        rng = np.random.default_rng(7)
+        target = [pressed_neighbour(w, loc=1, insert=insert, rng=rng)
+                  for w in words]
+        augm = batch("pressed_neighbour", words, loc=1, insert=insert,
+                     rng=np.random.default_rng(7))
+        assert augm.tolist() == target
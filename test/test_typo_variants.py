@@ -0,0 +1,62 @@
+from augtxt.typo import index_pmf, variants, batch
+from augtxt.augmenters import typo_variants, senttypo, AugmentationPlan
+import augtxt.keyboard_layouts as kbl
+import numpy as np
+import collections
+
+
+def test1():
+    assert index_pmf(2, 'm') == [0.25, 0.5, 0.25]
+    assert index_pmf(3, 'u') == [0.25] * 4
+    assert index_pmf(3, 7) == [0.0, 0.0, 0.0, 1.0]
+    assert index_pmf(0, 'b') == [1.0]
+    np.testing.assert_allclose(sum(index_pmf(12, 'e')), 1.0)
+    np.testing.assert_allclose(index_pmf(4, 1.0), [0, 0, 0, 0, 1])
+
+
+def test2():
+    v = variants("Kinder", "swap_consecutive", loc='u')
+    assert v == {w: 0.2 for w in
+                 ["iKnder", "Knider", "Kidner", "Kinedr", "Kindre"]}
+    # short words
+    assert variants("A", "pressed_twice") == {"AA": 1.0}
+    assert variants("A", "drop_char") == {"A": 1.0}
+
+
+def test3():
+    # exact probabilities match the frequencies of random draws
+    rng = np.random.default_rng(42)
+    n = 50000
+    for fn in ["pressed_shiftalt", "drop_n_next_twice", "pressed_twice"]:
+        v = variants("Hallo", fn, loc='b', keep_case=True,
+                     keymap=kbl.qwertz_de)
+        np.testing.assert_allclose(sum(v.values()), 1.0)
+        out = batch(fn, ["Hallo"] * n, loc='b', keep_case=True,
+                    keymap=kbl.qwertz_de, rng=rng)
+        freq = collections.Counter(out.tolist())
+        assert set(freq).issubset(set(v))
+        for w, p in v.items():
+            assert abs(freq[w] / n - p) < 0.01
+
+
+def test4():
+    settings = [
+        {'weight': 2, 'fn': 'typo.drop_n_next_twice',
+         'args': {'loc': ['m', 'e'], 'keep_case': True}},
+        {'weight': 1, 'fn': 'typo.swap_consecutive',
+         'args': {'loc': ['m', 'e'], 'keep_case': True}}]
+    v = typo_variants("Satz", settings)
+    np.testing.assert_allclose(sum(v.values()), 1.0)
+    n = 50000
+    augs = senttypo("Satz", AugmentationPlan(settings), num_augmentations=n,
+                    rng=np.random.default_rng(1))
+    for w, c in collections.Counter(augs).items():
+        assert abs(c / n - v[w]) < 0.01
+
+
+def test5():
+    try:
+        typo_variants("Satz", [{'weight': 1, 'fn': 'order.drop_word'}])
+        assert False
+    except ValueError:
+        pass
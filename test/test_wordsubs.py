@@ -0,0 +1,76 @@
+import numpy as np
+import itertools
+import warnings
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from augtxt.wordsubs import (
+        synonym_replacement, synonym_replacement_stream, _ncomb)
+
+synonyms = {'satz': ['sätze', 'anfangssatz'], 'ein': ['weiteres'],
+            'das': ['welches'], 'ist': ['war']}
+
+
+def test1():
+    assert _ncomb(5, 2) == 10
+    assert _ncomb(5, 0) == 1
+    assert _ncomb(3, 4) == 0
+    assert _ncomb(60, 30) == 118264581564861424
+
+
+def test2():
+    # many replaceable tokens: combinations are not enumerated
+    seq = ["das", "ist", "ein", "satz"] * 15
+    augs = synonym_replacement(
+        [seq], synonyms, num_augm=20, min_repl=2, max_repl=30,
+        sampling="random", rng=np.random.default_rng(1))[0]
+    assert len(augs) == 20
+    changed = [tuple(i for i, w in enumerate(aug) if w != seq[i])
+               for aug in augs]
+    assert len(set(changed)) == 20
+    assert all(2 <= len(c) <= 30 for c in changed)
+
+
+def test3():
+    # fewer combinations than augmentations: repeated in turn
+    seq = ["das", "ist", "kein", "satz"]
+    augs = synonym_replacement(
+        [seq], synonyms, num_augm=10, min_repl=3, max_repl=3,
+        sampling="random", rng=np.random.default_rng(2))[0]
+    assert len(augs) == 10
+    for aug in augs:
+        assert aug[:2] == ["welches", "war"] and aug[2] == "kein"
+
+
+def test4():
+    seq = ["das", "ist", "ein", "satz"]
+    a = synonym_replacement([seq], synonyms, 5, sampling="random",
+                            rng=np.random.default_rng(3))
+    b = synonym_replacement([seq], synonyms, 5, sampling="random",
+                            rng=np.random.default_rng(3))
+    assert a == b
+    try:
+        synonym_replacement([seq], synonyms, 5, sampling="foo")
+        assert False
+    except ValueError:
+        pass
+
+
+def test5():
+    seqs = [["das", "ist", "ein", "satz"], ["kein", "treffer"], ["ein"]]
+    expected = synonym_replacement(
+        seqs, synonyms, 3, rng=np.random.default_rng(4))
+    stream = synonym_replacement_stream(
+        iter(seqs), synonyms, 3, rng=np.random.default_rng(4))
+    pairs = list(stream)
+    assert [i for i, _ in pairs] == [0, 0, 0, 2, 2, 2]
+    assert [aug for i, aug in pairs if i == 0] == expected[0]
+    assert [aug for i, aug in pairs if i == 2] == expected[2]
+
+
+def test6():
+    # lazy: an endless corpus is consumed in chunks
+    seqs = itertools.repeat(["das", "ist", "ein", "satz"])
+    stream = synonym_replacement_stream(seqs, synonyms, 2)
+    chunk = list(itertools.islice(stream, 5))
+    assert [i for i, _ in chunk] == [0, 0, 1, 1, 2]
@@ -0,0 +1,35 @@
+from augtxt.augmenters import (
+    AugmentationPlan, wordtypo_batch, wordtypo_variants)
+import numpy as np
+import collections
+
+settings = [
+    {'p': 0.3, 'fn': 'typo.drop_n_next_twice',
+     'args': {'loc': ['m', 'e'], 'keep_case': True}},
+    {'p': 0.4, 'fn': 'typo.swap_consecutive',
+     'args': {'loc': ['m', 'e'], 'keep_case': True}},
+    {'p': 0.2, 'fn': 'typo.pressed_shiftalt',
+     'args': {'loc': 'u'}}]
+
+
+def test1():
+    tokens = ["Dies", "ist", "ein", "Satz", "."]
+    zero = [dict(s, p=0.0) for s in settings]
+    assert wordtypo_batch(tokens, zero) == tokens
+    assert wordtypo_batch([], settings) == []
+    a = wordtypo_batch(tokens, settings, rng=np.random.default_rng(1))
+    b = wordtypo_batch(tokens, settings, rng=np.random.default_rng(1))
+    assert a == b
+    assert len(a) == len(tokens)
+
+
+def test2():
+    # the same distribution as `wordtypo`
+    plan = AugmentationPlan(settings)
+    n = 50000
+    augs = wordtypo_batch(["Satz"] * n, plan, rng=np.random.default_rng(42))
+    v = wordtypo_variants("Satz", plan)
+    freq = collections.Counter(augs)
+    assert set(freq).issubset(set(v))
+    for w, p in v.items():
+        assert abs(freq[w] / n - p) < 0.01